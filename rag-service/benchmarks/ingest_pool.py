@@ -0,0 +1,65 @@
+"""
+Benchmark: ingest embedding throughput (chunks/sec) vs worker process count.
+
+Replicates the policy corpus chunks up to --chunks, then embeds them
+in-process (workers=1) and with EmbeddingPool at each worker count. Pool
+start-up (spawning processes, loading the model in each) is reported
+separately from steady-state throughput, and every run is checked against
+the in-process embeddings. Run from rag-service/:
+
+    python -m benchmarks.ingest_pool --chunks 20000 --workers 1 2 4 8 --threads-per-worker 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.embed_pool import EmbeddingPool
+from src.encoders import load_encoder
+from src.ingest import chunk_text, load_documents
+
+
+def corpus(n: int) -> list[str]:
+    chunks = [chunk for _, content in load_documents() for chunk in chunk_text(content)]
+    # Suffix each copy so no two texts are identical (no accidental caching).
+    return [f"{chunks[i % len(chunks)]} ({i})" for i in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--shard-size", type=int, default=256)
+    args = parser.parse_args()
+
+    texts = corpus(args.chunks)
+    model = load_encoder()
+    model.encode(texts[:64], show_progress_bar=False)
+
+    started = time.perf_counter()
+    reference = model.encode(texts, show_progress_bar=False)
+    baseline = len(texts) / (time.perf_counter() - started)
+
+    print(f"{len(texts)} chunks, {args.threads_per_worker} threads/worker, shards of {args.shard_size}")
+    print(f"  {'workers':>7} {'startup s':>10} {'chunks/s':>10} {'speedup':>8} {'max |Δ|':>9}")
+    print(f"  {'in-proc':>7} {'-':>10} {baseline:>10.0f} {1.0:>8.2f} {0.0:>9.1e}")
+    for workers in args.workers:
+        if workers <= 1:
+            continue
+        pool = EmbeddingPool(workers, args.threads_per_worker, args.shard_size)
+        started = time.perf_counter()
+        pool.encode(texts[: workers * args.shard_size])  # spawn + load the model in every worker
+        startup = time.perf_counter() - started
+
+        started = time.perf_counter()
+        embeddings = pool.encode(texts)
+        rate = len(texts) / (time.perf_counter() - started)
+        pool.shutdown()
+        drift = float(np.abs(embeddings - reference).max())
+        print(f"  {workers:>7} {startup:>10.2f} {rate:>10.0f} {rate / baseline:>8.2f} {drift:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
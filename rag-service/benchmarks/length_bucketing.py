@@ -0,0 +1,59 @@
+"""
+Benchmark: padding ratio and encode throughput, file order vs length-bucketed.
+
+Encodes the policy corpus chunks (replicated up to --chunks, in file order)
+the way ingest does — one encode call with INGEST_BATCH_SIZE batches — once
+as-is and once sorted by token length, then restores the order and checks
+the embeddings match. Note sentence-transformers (torch backend) already
+sorts each encode call by character length internally, so the gain there is
+smaller than on the ONNX backend, which batches in the order given.
+Run from rag-service/:
+
+    python -m benchmarks.length_bucketing --chunks 5000 --batch-sizes 16 32 64
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.encoders import load_encoder, padding_ratio, token_lengths
+from src.ingest import chunk_text, load_documents
+
+
+def corpus(n: int) -> list[str]:
+    chunks = [chunk for _, content in load_documents() for chunk in chunk_text(content)]
+    return [chunks[i % len(chunks)] for i in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=5_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 32, 64])
+    args = parser.parse_args()
+
+    texts = corpus(args.chunks)
+    model = load_encoder()
+    model.encode(texts[:64], show_progress_bar=False)
+    lengths = token_lengths(model, texts)
+    print(f"{len(texts)} chunks, token lengths min/median/max = "
+          f"{lengths.min()}/{int(np.median(lengths))}/{lengths.max()}")
+    print(f"  {'batch':>5} {'order':<9} {'padding':>8} {'chunks/s':>9} {'max |Δ|':>9}")
+
+    for batch_size in args.batch_sizes:
+        reference = None
+        for name, order in (("file", np.arange(len(texts))), ("bucketed", np.argsort(lengths, kind="stable"))):
+            started = time.perf_counter()
+            encoded = model.encode([texts[i] for i in order], batch_size=batch_size, show_progress_bar=False)
+            rate = len(texts) / (time.perf_counter() - started)
+            embeddings = np.empty_like(encoded)
+            embeddings[order] = encoded
+            if reference is None:
+                reference = embeddings
+            drift = float(np.abs(embeddings - reference).max())
+            padding = padding_ratio(lengths[order], batch_size)
+            print(f"  {batch_size:>5} {name:<9} {padding:>8.1%} {rate:>9.0f} {drift:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: memory, latency and recall@k of NumpyVectorStore quantization modes.
+
+Synthetic clustered 384-dim vectors stand in for chunk embeddings (real ones
+cluster by topic); queries are noisy copies of random chunks. Recall is
+measured against the exact float32 scan. Run from rag-service/:
+
+    python -m benchmarks.quantization --chunks 100000 --queries 200 --modes none int8 binary
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.vector_store import NumpyVectorStore
+
+DIM = 384
+
+
+def clustered_vectors(n: int, rng: np.random.Generator, clusters: int = 256, spread: float = 0.6) -> np.ndarray:
+    centers = rng.standard_normal((clusters, DIM)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + spread * rng.standard_normal((n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build(mode: str, corpus: np.ndarray, candidates: int) -> tuple[NumpyVectorStore, float]:
+    store = NumpyVectorStore(quantization=mode, rescore_candidates=candidates)
+    ids = [str(i) for i in range(len(corpus))]
+    started = time.perf_counter()
+    store.add(ids=ids, documents=[""] * len(ids), embeddings=corpus, metadatas=[{}] * len(ids))
+    return store, time.perf_counter() - started
+
+
+def measure(store: NumpyVectorStore, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, list[set[str]]]:
+    timings, found = [], []
+    for q in queries:
+        started = time.perf_counter()
+        result = store.query(q[np.newaxis, :], n_results=top_k)[0]
+        timings.append((time.perf_counter() - started) * 1e3)
+        found.append(set(result.ids))
+    return np.array(timings), found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--candidates", type=int, default=200, help="rescore candidates per query")
+    parser.add_argument("--modes", nargs="+", default=["none", "int8", "binary"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    corpus = clustered_vectors(args.chunks, rng)
+    queries = corpus[rng.integers(0, args.chunks, args.queries)] + 0.05 * rng.standard_normal((args.queries, DIM)).astype(np.float32)
+
+    exact, _ = build("none", corpus, args.candidates)
+    _, truth = measure(exact, queries, args.top_k)
+
+    print(f"{args.chunks} chunks, {args.queries} queries, top_k={args.top_k}, {args.candidates} rescore candidates")
+    print(f"  {'mode':<8} {'index MB':>9} {'build s':>8} {'p50 ms':>8} {'p99 ms':>8} {'recall@k':>9}")
+    for mode in args.modes:
+        store, build_s = build(mode, corpus, args.candidates)
+        timings, found = measure(store, queries, args.top_k)
+        recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+        print(
+            f"  {mode:<8} {store.nbytes / 2**20:>9.1f} {build_s:>8.2f} "
+            f"{np.percentile(timings, 50):>8.2f} {np.percentile(timings, 99):>8.2f} {recall:>9.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
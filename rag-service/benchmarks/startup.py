@@ -0,0 +1,103 @@
+"""
+Benchmark: process start-up — import cost per module, time to /live and /ready.
+
+1. Runs `python -X importtime -c "import src.main"` in a fresh interpreter
+   and reports the slowest imports (cumulative) and self time per top-level
+   package, and flags any heavy dependency pulled in at import.
+2. Starts uvicorn on a free port and polls until GET /live, then GET /ready,
+   answer 200 (ready includes model load, ingest and warm-up).
+
+Run from rag-service/:
+
+    python -m benchmarks.startup --top 15
+"""
+
+import argparse
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+HEAVY = ("torch", "sentence_transformers", "transformers", "chromadb", "onnxruntime", "tokenizers")
+
+
+def import_report(top: int) -> None:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []  # (self µs, cumulative µs, module)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+
+    total = sum(r[0] for r in rows)
+    print(f"import src.main: {total / 1e3:.0f}ms, {len(rows)} modules")
+    print("  slowest imports (cumulative):")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"    {cumulative_us / 1e3:>8.1f}ms  {name}")
+
+    by_package: dict[str, int] = defaultdict(int)
+    for self_us, _, name in rows:
+        by_package[name.split(".")[0]] += self_us
+    print("  self time by package:")
+    for package, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {us / 1e3:>8.1f}ms  {package}")
+
+    heavy = sorted({r[2].split(".")[0] for r in rows} & set(HEAVY))
+    print(f"  heavy dependencies imported eagerly: {', '.join(heavy) or 'none'}")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(url: str, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def serve_report(timeout: float) -> None:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        live = _wait_for(f"http://127.0.0.1:{port}/live", started, timeout)
+        ready = _wait_for(f"http://127.0.0.1:{port}/ready", started, timeout)
+    finally:
+        server.terminate()
+        server.wait()
+    print(f"uvicorn start → /live 200: {live:.2f}s   → /ready 200: {ready:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for /ready")
+    parser.add_argument("--imports-only", action="store_true", help="skip starting the server")
+    args = parser.parse_args()
+
+    import_report(args.top)
+    if not args.imports_only:
+        serve_report(args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Eval: static (lookup-table) query encoder vs the full embedding model.
+
+Indexes the real policy corpus with the full model, then runs the same
+questions through both query encoders and reports encode latency and
+recall@k of the static encoder's top-k against the full model's top-k.
+Distills the static table first if STATIC_ENCODER_DIR doesn't have one.
+Run from rag-service/:
+
+    python -m benchmarks.static_encoder --top-k 3
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.config import STATIC_ENCODER_DIR
+from src.encoders import Encoder, load_static_encoder
+from src.ingest import chunk_text, get_embedding_model, load_documents
+from src.vector_store import NumpyVectorStore
+
+QUESTIONS = [
+    "What is the return window for electronics?",
+    "Is there a restocking fee?",
+    "How do I return a damaged item?",
+    "Can I return a product without the original packaging?",
+    "How long does a refund take?",
+    "How long does standard shipping take?",
+    "Do you offer free shipping?",
+    "Can I ship to a PO box?",
+    "My package is late, what are my options?",
+    "Do you ship internationally?",
+    "What does the warranty cover?",
+    "How do I file a warranty claim?",
+    "Is accidental damage covered by warranty?",
+    "How long is the warranty on laptops?",
+    "What compensation do I get for a late delivery?",
+    "Can I get a discount code after a bad experience?",
+    "Who approves compensation above the limit?",
+    "My order arrived broken",
+    "wrong item delivered",
+    "refund to original payment method",
+]
+
+
+def _timed_encode(encoder: Encoder, questions: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    vectors, timings = [], []
+    for q in questions:
+        started = time.perf_counter()
+        vectors.append(encoder.encode([q], show_progress_bar=False)[0])
+        timings.append((time.perf_counter() - started) * 1e6)
+    return np.stack(vectors), np.array(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    model = get_embedding_model()
+    static = load_static_encoder(STATIC_ENCODER_DIR, lambda: model)
+
+    chunks = [(name, chunk) for name, content in load_documents() for chunk in chunk_text(content)]
+    store = NumpyVectorStore(quantization="none")
+    store.add(
+        ids=[str(i) for i in range(len(chunks))],
+        documents=[chunk for _, chunk in chunks],
+        embeddings=model.encode([chunk for _, chunk in chunks], show_progress_bar=False),
+        metadatas=[{"source": name} for name, _ in chunks],
+    )
+
+    model.encode(["warm-up"], show_progress_bar=False)
+    full_vectors, full_us = _timed_encode(model, QUESTIONS)
+    static_vectors, static_us = _timed_encode(static, QUESTIONS)
+
+    full_hits = store.query(full_vectors, n_results=args.top_k)
+    static_hits = store.query(static_vectors, n_results=args.top_k)
+    recall = np.mean([len(set(f.ids) & set(s.ids)) / len(f.ids) for f, s in zip(full_hits, static_hits)])
+    top1 = np.mean([f.ids[0] == s.ids[0] for f, s in zip(full_hits, static_hits)])
+    cosine = np.mean(np.sum(full_vectors * static_vectors, axis=1))
+
+    print(f"{len(QUESTIONS)} questions over {len(chunks)} policy chunks, top_k={args.top_k}")
+    print(f"  {'encoder':<8} {'p50 µs':>10} {'p99 µs':>10}")
+    for name, us in (("full", full_us), ("static", static_us)):
+        print(f"  {name:<8} {np.percentile(us, 50):>10.1f} {np.percentile(us, 99):>10.1f}")
+    print(f"  static recall@{args.top_k} vs full: {recall:.3f}   top-1 agreement: {top1:.3f}")
+    print(f"  mean cosine(full, static) query embedding: {cosine:.3f}")
+
+
+if __name__ == "__main__":
+    main()
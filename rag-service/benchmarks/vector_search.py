@@ -0,0 +1,80 @@
+"""
+Benchmark: ChromaStore (HNSW) vs NumpyVectorStore (exact) query latency.
+
+Uses synthetic unit vectors of the MiniLM dimension, so no model download is
+needed. Run from rag-service/:
+
+    python -m benchmarks.vector_search --chunks 500 5000 --queries 500 --ef-search 10 100 400
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.vector_store import ChromaStore, NumpyVectorStore, VectorStore
+
+DIM = 384
+
+
+def _unit_vectors(n: int, rng: np.random.Generator) -> np.ndarray:
+    vectors = rng.standard_normal((n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _latencies_us(
+    store: VectorStore,
+    queries: np.ndarray,
+    top_k: int,
+    ef_search: int | None = None,
+) -> tuple[np.ndarray, list[list[str]]]:
+    timings, ids = [], []
+    for q in queries:
+        started = time.perf_counter()
+        result = store.query(q[np.newaxis, :], n_results=top_k, ef_search=ef_search)[0]
+        timings.append((time.perf_counter() - started) * 1e6)
+        ids.append(result.ids)
+    return np.array(timings), ids
+
+
+def run(n_chunks: int, n_queries: int, top_k: int, ef_values: list[int], seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    corpus = _unit_vectors(n_chunks, rng)
+    queries = _unit_vectors(n_queries, rng)
+    ids = [f"chunk_{i}" for i in range(n_chunks)]
+    docs = [f"document {i}" for i in range(n_chunks)]
+    metas = [{"source": "synthetic.md", "chunk_index": str(i)} for i in range(n_chunks)]
+
+    ChromaStore(name=f"bench_{n_chunks}").drop()  # leftovers from an earlier run
+    collection = ChromaStore(name=f"bench_{n_chunks}")
+    collection.add(ids=ids, documents=docs, embeddings=corpus, metadatas=metas)
+
+    store = NumpyVectorStore()
+    store.add(ids=ids, documents=docs, embeddings=corpus, metadatas=metas)
+
+    numpy_us, exact_ids = _latencies_us(store, queries, top_k)
+    rows = [("numpy", numpy_us, 1.0)]
+    for ef in [None, *ef_values]:
+        chroma_us, chroma_ids = _latencies_us(collection, queries, top_k, ef_search=min(ef, n_chunks) if ef else None)
+        recall = np.mean([len(set(a) & set(b)) / top_k for a, b in zip(chroma_ids, exact_ids)])
+        rows.append((f"chroma ef={ef or 'default'}", chroma_us, recall))
+
+    print(f"\n{n_chunks} chunks, {n_queries} queries, top_k={top_k}")
+    print(f"  {'backend':<20} {'p50 µs':>10} {'p99 µs':>10} {'recall@k':>10}")
+    for name, us, rec in rows:
+        print(f"  {name:<20} {np.percentile(us, 50):>10.1f} {np.percentile(us, 99):>10.1f} {rec:>10.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, nargs="+", default=[500, 5000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--ef-search", type=int, nargs="*", default=[], help="per-query ef_search values to compare")
+    args = parser.parse_args()
+    for n in args.chunks:
+        run(n, args.queries, args.top_k, args.ef_search)
+
+
+if __name__ == "__main__":
+    main()
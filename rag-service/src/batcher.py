@@ -0,0 +1,161 @@
+"""
+Micro-batching query encoder.
+
+Each /search used to call model.encode([query]) with a batch of one, leaving
+most of the matmul throughput of MiniLM unused. The batcher puts a short
+collection window in front of the model: queries arriving within
+QUERY_BATCH_WINDOW_MS (up to QUERY_BATCH_MAX_SIZE) are encoded together in
+one call and the rows are handed back to the waiting search threads.
+
+The window only stays open while another search is running that could
+still join: once every in-flight search is in the batch, it is encoded at
+once, so a lone query at low load pays no wait.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from . import metrics
+from .config import QUERY_BATCH_MAX_SIZE, QUERY_BATCH_WINDOW_MS, QUERY_ENCODER, SEARCH_WORKERS
+from .executor import get_search_executor
+from .ingest import get_query_encoder
+
+logger = logging.getLogger(__name__)
+
+EncodeFn = Callable[[list[str]], np.ndarray]
+
+
+@dataclass
+class _PendingQuery:
+    text: str
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+class QueryBatcher:
+    """Coalesce concurrent encode requests into batched model calls."""
+
+    def __init__(
+        self,
+        encode_fn: EncodeFn,
+        window_ms: float,
+        max_size: int,
+        in_flight: Callable[[], int] | None = None,
+    ) -> None:
+        self._encode_fn = encode_fn
+        self._window = window_ms / 1000.0
+        self._max_size = max(1, max_size)
+        # How many callers could be in a batch right now; None = always wait the window
+        self._in_flight = in_flight
+        self._queue: queue.Queue[_PendingQuery | None] = queue.Queue()
+        self._batch_size = metrics.summary("query_batch_size")
+        self._queue_wait = metrics.summary("query_batch_queue_wait_ms")
+        self._thread = threading.Thread(target=self._run, name="query-batcher", daemon=True)
+        self._thread.start()
+
+    def encode(self, text: str) -> np.ndarray:
+        """Encode a single query, blocking until its batch has been processed."""
+        pending = _PendingQuery(text)
+        self._queue.put(pending)
+        return pending.future.result()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    # ─── Worker ──────────────────────────────────────────────────────────────
+
+    def _collect(self, first: _PendingQuery) -> tuple[list[_PendingQuery], bool]:
+        """Gather queries until the window closes, the batch is full, or no one else can join."""
+        batch = [first]
+        deadline = time.perf_counter() + self._window
+        while len(batch) < self._max_size:
+            if self._in_flight is not None and len(batch) >= self._in_flight() and self._queue.empty():
+                break
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, closing = self._collect(first)
+
+            started = time.perf_counter()
+            for item in batch:
+                self._queue_wait.observe((started - item.enqueued_at) * 1000)
+            self._batch_size.observe(len(batch))
+
+            try:
+                embeddings = self._encode_fn([item.text for item in batch])
+            except Exception as e:
+                for item in batch:
+                    item.future.set_exception(e)
+            else:
+                for item, embedding in zip(batch, embeddings):
+                    item.future.set_result(embedding)
+
+            if closing:
+                return
+
+
+# ─── Module-level singleton ──────────────────────────────────────────────────
+
+_query_batcher: QueryBatcher | None = None
+_batcher_lock = threading.Lock()
+
+
+def _encode_batch(texts: list[str]) -> np.ndarray:
+    return get_query_encoder().encode(texts, show_progress_bar=False)
+
+
+def _searches_in_flight() -> int:
+    """Searches running on the search executor — the only callers that can join a batch."""
+    return min(get_search_executor().pending, SEARCH_WORKERS)
+
+
+def encode_query(text: str) -> np.ndarray:
+    """
+    Embed one query, coalescing with concurrent callers when batching is on.
+
+    With QUERY_BATCH_WINDOW_MS = 0 the model is called directly, as is the
+    static encoder — a table lookup gains nothing from batching.
+    """
+    global _query_batcher
+    if QUERY_BATCH_WINDOW_MS <= 0 or QUERY_ENCODER == "static":
+        return _encode_batch([text])[0]
+    if _query_batcher is None:
+        with _batcher_lock:
+            if _query_batcher is None:
+                # Each search worker waits on one query, so batches can't outgrow SEARCH_WORKERS
+                max_size = min(QUERY_BATCH_MAX_SIZE, SEARCH_WORKERS)
+                _query_batcher = QueryBatcher(
+                    _encode_batch, QUERY_BATCH_WINDOW_MS, max_size, in_flight=_searches_in_flight
+                )
+                logger.info(f"Query batcher: window {QUERY_BATCH_WINDOW_MS}ms, max batch {max_size}")
+    return _query_batcher.encode(text)
+
+
+def shutdown_query_batcher() -> None:
+    """Stop the batcher thread (called on app shutdown)."""
+    global _query_batcher
+    if _query_batcher is not None:
+        _query_batcher.close()
+        _query_batcher = None
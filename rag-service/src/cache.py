@@ -0,0 +1,140 @@
+"""
+Bounded in-process LRU cache with TTL expiry, plus single-flight coalescing.
+
+The cache is bounded both by entry count and by an approximate byte budget,
+so a burst of unique queries can't grow memory without limit. Hits, misses
+and evictions are published as counters on GET /metrics under the cache's
+name. SingleFlight covers the gap before a result is cached: concurrent
+identical requests share one computation.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Generic, Hashable, TypeVar
+
+from . import metrics
+
+V = TypeVar("V")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query for cache keys: trimmed and whitespace-collapsed.
+    Case is kept — EMBEDDING_MODEL may be a cased model, where "Returns" and
+    "returns" embed differently.
+    """
+    return " ".join(query.split())
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe LRU cache bounded by entries and bytes, with per-entry TTL."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        sizeof: Callable[[V], int],
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        self._entries: OrderedDict[Hashable, tuple[V, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = metrics.counter(f"{name}_hits")
+        self._misses = metrics.counter(f"{name}_misses")
+        self._evictions = metrics.counter(f"{name}_evictions")
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the cached value, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses.inc()
+                return None
+            self._entries.move_to_end(key)
+            self._hits.inc()
+            return entry[0]
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Insert or replace a value, evicting least-recently-used entries."""
+        if not self.enabled:
+            return
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl_seconds)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions.inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+class SingleFlight(Generic[V]):
+    """
+    Deduplicate concurrent calls with the same key.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block on the same future and receive the same result (or
+    exception). Nothing is remembered once the call completes.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._coalesced = metrics.counter(f"{name}_coalesced")
+
+    def do(self, key: Hashable, fn: Callable[[], V]) -> V:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            self._coalesced.inc()
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -17,6 +17,33 @@ POLICIES_DIR = BASE_DIR / "data" / "policies"
 
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 
+# Inference backend (see encoders.py):
+# "torch": sentence-transformers on PyTorch.
+# "onnx":  the model's ONNX export on ONNX Runtime — no torch at runtime,
+#          faster on CPU. Needs the `onnx` extra. The export is downloaded from
+#          the Hub unless EMBEDDING_ONNX_DIR points at a local copy;
+#          EMBEDDING_ONNX_QUANTIZE=true adds dynamic int8 weight quantization.
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", None)
+EMBEDDING_ONNX_QUANTIZE = os.getenv("EMBEDDING_ONNX_QUANTIZE", "false").lower() == "true"
+
+# Query-side encoder:
+# "model":  the embedding model above (same as ingest).
+# "static": a per-token lookup table distilled from that model, mean-pooled —
+#           microsecond encodes with no torch, slightly lower recall. The table
+#           is distilled into STATIC_ENCODER_DIR on first use if missing, and
+#           re-distilled when it came from a different EMBEDDING_MODEL.
+
+QUERY_ENCODER = os.getenv("QUERY_ENCODER", "model")
+STATIC_ENCODER_DIR = Path(os.getenv("STATIC_ENCODER_DIR", str(BASE_DIR / "data" / "static_encoder")))
+
+# Chunk embeddings are cached on disk in this SQLite file, keyed by model and
+# chunk text hash, so a rebuild or a restart of an in-memory deployment only
+# embeds chunks it has never seen. Set EMBEDDING_CACHE_PATH="" to disable.
+
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", str(BASE_DIR / "data" / "embedding_cache.sqlite3"))
+
 # ─── Chunking ────────────────────────────────────────────────────────────────
 # 500 chars ≈ ~100 tokens — small enough for precise retrieval,
 # large enough to preserve context. 50-char overlap prevents info loss
@@ -25,18 +52,162 @@ EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
 
+# ─── Ingest Batching ─────────────────────────────────────────────────────────
+# Each encode batch is padded to its longest chunk, and chunk_text output
+# mixes short headings with full 500-char paragraphs. With length bucketing
+# on, ingest sorts chunks by token length before batching (so each batch
+# holds similar lengths), then restores the original order. The resulting
+# padding ratio and chunks/sec are published on GET /metrics.
+
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "32"))
+INGEST_LENGTH_BUCKETING = os.getenv("INGEST_LENGTH_BUCKETING", "true").lower() == "true"
+
+# ─── Parallel Ingest ─────────────────────────────────────────────────────────
+# INGEST_WORKERS > 1 embeds chunks in that many worker processes, each with
+# its own model copy (≈ model size in RAM per worker) limited to
+# INGEST_THREADS_PER_WORKER threads — on a 32-core box, e.g. 8 × 4. Chunks
+# go out in shards of INGEST_SHARD_SIZE; corpora no bigger than one shard
+# (like the bundled policies) are embedded in-process. 0 or 1 = off.
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "0"))
+INGEST_THREADS_PER_WORKER = int(os.getenv("INGEST_THREADS_PER_WORKER", "1"))
+INGEST_SHARD_SIZE = int(os.getenv("INGEST_SHARD_SIZE", "256"))
+
+# ─── Policy Watcher ──────────────────────────────────────────────────────────
+# With POLICY_WATCH_ENABLED=true, edits in POLICIES_DIR are re-indexed without
+# a manual POST /ingest: once changes pause for POLICY_WATCH_DEBOUNCE_MS, the
+# touched files go to an incremental ingest job. A continuous stream of
+# changes is still flushed at least every POLICY_WATCH_MAX_DELAY_MS.
+# Filesystem events are used where available; POLICY_WATCH_POLLING=true
+# forces stat polling every POLICY_WATCH_POLL_MS instead, for mounts that
+# don't deliver events (e.g. Docker bind mounts on macOS / Windows).
+
+POLICY_WATCH_ENABLED = os.getenv("POLICY_WATCH_ENABLED", "false").lower() == "true"
+POLICY_WATCH_DEBOUNCE_MS = int(os.getenv("POLICY_WATCH_DEBOUNCE_MS", "500"))
+POLICY_WATCH_MAX_DELAY_MS = int(os.getenv("POLICY_WATCH_MAX_DELAY_MS", "5000"))
+POLICY_WATCH_POLLING = os.getenv("POLICY_WATCH_POLLING", "false").lower() == "true"
+POLICY_WATCH_POLL_MS = int(os.getenv("POLICY_WATCH_POLL_MS", "1000"))
+
 # ─── ChromaDB ────────────────────────────────────────────────────────────────
 
 CHROMA_COLLECTION = os.getenv("CHROMA_COLLECTION", "ecommerce_policies")
 
 # persist_directory: set to None for in-memory (default for dev/demo),
-# or a path string for persistent storage.
+# or a path string for persistent storage. A persisted collection records a
+# fingerprint of the corpus and settings it was built from; startup reuses it
+# as-is when that still matches, instead of re-embedding everything.
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", None)
 
+# Full re-ingests build a new versioned collection and flip searches to it
+# only once it is complete (CHROMA_COLLECTION becomes an alias). The replaced
+# collection is kept this long for POST /index/rollback, then dropped.
+
+INDEX_ROLLBACK_GRACE_SECONDS = float(os.getenv("INDEX_ROLLBACK_GRACE_SECONDS", "900"))
+
+# ─── Vector Backend ──────────────────────────────────────────────────────────
+# Which VectorStore implementation ingest and retrieval use (see vector_store.py):
+# "chroma": ChromaDB collection (HNSW index, optional persistence).
+# "numpy":  exact in-process search — one normalized float32 matrix and a
+#           single matrix-vector product per query. Faster for small corpora
+#           like ours (a few hundred chunks); rebuilt by every ingest.
+
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+
+# ─── Quantized Index (numpy backend) ─────────────────────────────────────────
+# "none": exact scan over float32 vectors (fine for a few hundred chunks).
+# "int8":   scan 1-byte-per-dimension codes (~4x less memory).
+# "binary": Hamming scan over packed sign bits (~32x less memory).
+# Both then rescore the best QUANTIZED_RESCORE_CANDIDATES per query with
+# full-precision vectors, which are memory-mapped from QUANTIZED_RESCORE_DIR
+# (default: the system temp dir — keep it off tmpfs to save RAM).
+
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none")
+QUANTIZED_RESCORE_CANDIDATES = int(os.getenv("QUANTIZED_RESCORE_CANDIDATES", "200"))
+QUANTIZED_RESCORE_DIR = os.getenv("QUANTIZED_RESCORE_DIR", None)
+
+# ─── HNSW Index (chroma backend) ─────────────────────────────────────────────
+# M: graph degree — more links = better recall, more memory, slower build.
+# CONSTRUCTION_EF: candidate list while building — higher = better graph.
+# SEARCH_EF: candidate list per query — the main recall/latency knob. It can
+# be raised per request via SearchRequest.ef_search.
+# A persisted index built with another M or CONSTRUCTION_EF is rebuilt on
+# startup; a changed SEARCH_EF is applied to it in place.
+
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_CONSTRUCTION_EF = int(os.getenv("HNSW_CONSTRUCTION_EF", "100"))
+HNSW_SEARCH_EF = int(os.getenv("HNSW_SEARCH_EF", "100"))
+
+# ─── PCA Reduction ───────────────────────────────────────────────────────────
+# Project stored and query embeddings onto the top PCA_DIM principal
+# components, fitted over the chunk embeddings at ingest (0 = off, keep the
+# model's full 384 dims). 128 dims cuts index memory and scan cost ~3x.
+# With CHROMA_PERSIST_DIR set, the projection is saved alongside the index.
+
+PCA_DIM = int(os.getenv("PCA_DIM", "0"))
+
 # ─── Retrieval ────────────────────────────────────────────────────────────────
 
 DEFAULT_TOP_K = int(os.getenv("DEFAULT_TOP_K", "3"))
 
+# Upper bound on queries per POST /search/batch call.
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", "32"))
+
+# ─── Warm-up ─────────────────────────────────────────────────────────────────
+# Representative queries run through encode + vector query at startup, after
+# ingest and before GET /ready reports ready, so lazy weight paging,
+# tokenizer init and allocator growth aren't paid by the first real search.
+# "|"-separated; set WARMUP_QUERIES="" to skip warm-up.
+
+WARMUP_QUERIES = [
+    q.strip()
+    for q in os.getenv(
+        "WARMUP_QUERIES",
+        "What is the return window?|How long does shipping take?|"
+        "Is my item covered by warranty?|Can I get compensation for a late order?",
+    ).split("|")
+    if q.strip()
+]
+
+# ─── Search Concurrency ──────────────────────────────────────────────────────
+# Encoding + vector search is synchronous CPU work, so it runs on a dedicated
+# thread pool instead of the event loop. At most SEARCH_WORKERS searches run
+# at once and SEARCH_QUEUE_SIZE more may wait; anything beyond that is shed
+# with 503 + Retry-After instead of queueing without bound.
+
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "4"))
+SEARCH_QUEUE_SIZE = int(os.getenv("SEARCH_QUEUE_SIZE", "32"))
+SEARCH_RETRY_AFTER = int(os.getenv("SEARCH_RETRY_AFTER", "1"))
+
+# ─── Query Micro-batching ────────────────────────────────────────────────────
+# Concurrent searches are coalesced into one model.encode call: the batcher
+# waits up to QUERY_BATCH_WINDOW_MS (or until QUERY_BATCH_MAX_SIZE queries
+# have arrived) before encoding, but only while other searches are running
+# that could still join — a lone query is encoded at once. A window of 0
+# disables batching. Each search worker waits on one query, so the effective
+# max batch is min(QUERY_BATCH_MAX_SIZE, SEARCH_WORKERS).
+
+QUERY_BATCH_WINDOW_MS = float(os.getenv("QUERY_BATCH_WINDOW_MS", "3"))
+QUERY_BATCH_MAX_SIZE = int(os.getenv("QUERY_BATCH_MAX_SIZE", "16"))
+
+# ─── Query Embedding Cache ───────────────────────────────────────────────────
+# Support agents repeat the same handful of policy questions all day, so query
+# embeddings are cached in-process (LRU, bounded by entries and bytes, with a
+# TTL). A 384-dim float32 vector is ~1.5KB, so the defaults hold ~10k queries
+# in ~16MB. Set QUERY_EMBEDDING_CACHE_SIZE=0 to disable.
+
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "10000"))
+QUERY_EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("QUERY_EMBEDDING_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", "3600"))
+
+# ─── Search Result Cache ─────────────────────────────────────────────────────
+# Whole SearchResponses keyed by (normalized query, top_k, collection version).
+# A hit skips both encoding and the vector query; every ingest bumps the
+# version, so results from an older policy set are never served.
+
+SEARCH_RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "5000"))
+SEARCH_RESULT_CACHE_MAX_BYTES = int(os.getenv("SEARCH_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SEARCH_RESULT_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_RESULT_CACHE_TTL_SECONDS", "3600"))
+
 # ─── Server ───────────────────────────────────────────────────────────────────
 
 HOST = os.getenv("RAG_HOST", "0.0.0.0")
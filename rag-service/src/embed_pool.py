@@ -0,0 +1,118 @@
+"""
+Multi-process embedding pool for ingest.
+
+model.encode runs in one process, and PyTorch / ONNX Runtime stop scaling
+well past a handful of intra-op threads — a full re-ingest on a many-core
+box leaves most cores idle. EmbeddingPool spreads the work over
+INGEST_WORKERS processes, each loading its own copy of the embedding model
+once (in the pool initializer) and limited to INGEST_THREADS_PER_WORKER
+threads so the workers don't oversubscribe the machine.
+
+Chunks are split into contiguous shards of INGEST_SHARD_SIZE; shard results
+come back in submission order, so the concatenated embeddings line up
+with the input chunks.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import numpy as np
+
+from .config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    INGEST_SHARD_SIZE,
+    INGEST_THREADS_PER_WORKER,
+    INGEST_WORKERS,
+)
+from .encoders import Encoder, load_encoder
+
+logger = logging.getLogger(__name__)
+
+
+# ─── Worker process side ─────────────────────────────────────────────────────
+
+_worker_model: Encoder | None = None
+
+
+def _init_worker(backend: str, model_name: str, threads: int) -> None:
+    """Load the model once per worker process, with a capped thread count."""
+    global _worker_model
+    threads_str = str(threads)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = threads_str
+    if backend == "torch":
+        import torch
+
+        torch.set_num_threads(threads)
+    _worker_model = load_encoder(backend, model_name, threads=threads)
+
+
+def _encode_shard(texts: list[str], batch_size: int) -> np.ndarray:
+    return _worker_model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+
+
+# ─── Pool ────────────────────────────────────────────────────────────────────
+
+
+class EmbeddingPool:
+    """Process pool whose workers each hold an embedding model."""
+
+    def __init__(
+        self,
+        workers: int,
+        threads_per_worker: int = 1,
+        shard_size: int = 256,
+        backend: str = EMBEDDING_BACKEND,
+        model_name: str = EMBEDDING_MODEL,
+    ) -> None:
+        self.workers = workers
+        self.shard_size = shard_size
+        # spawn, not fork: forking a process that has already initialized
+        # torch / OpenMP thread pools can deadlock the children.
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(backend, model_name, threads_per_worker),
+        )
+
+    def encode(self, texts: list[str], batch_size: int = 32) -> np.ndarray:
+        """Embed texts across the pool; rows are in the same order as texts."""
+        return np.concatenate(list(self.iter_encode(texts, batch_size)))
+
+    def iter_encode(self, texts: list[str], batch_size: int = 32) -> Iterator[np.ndarray]:
+        """Embeddings shard by shard, in order, as soon as each is done (for progress reporting)."""
+        shards = [texts[start:start + self.shard_size] for start in range(0, len(texts), self.shard_size)]
+        return self._executor.map(_encode_shard, shards, [batch_size] * len(shards))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ─── Module-level singleton ──────────────────────────────────────────────────
+
+_embedding_pool: EmbeddingPool | None = None
+
+
+def get_embedding_pool() -> EmbeddingPool:
+    """Get or create the ingest pool (workers load their models on first use)."""
+    global _embedding_pool
+    if _embedding_pool is None:
+        _embedding_pool = EmbeddingPool(INGEST_WORKERS, INGEST_THREADS_PER_WORKER, INGEST_SHARD_SIZE)
+        logger.info(
+            f"Embedding pool: {INGEST_WORKERS} processes × {INGEST_THREADS_PER_WORKER} threads, "
+            f"shards of {INGEST_SHARD_SIZE} chunks"
+        )
+    return _embedding_pool
+
+
+def shutdown_embedding_pool() -> None:
+    """Stop the worker processes (called on app shutdown)."""
+    global _embedding_pool
+    if _embedding_pool is not None:
+        _embedding_pool.shutdown()
+        _embedding_pool = None
@@ -0,0 +1,115 @@
+"""
+Persistent on-disk cache of chunk embeddings.
+
+Most chunk texts are identical from one ingest to the next — after a full
+rebuild, a restart of an in-memory deployment, or an edit elsewhere in the
+corpus. ingest.embed_chunks looks each chunk up here by (model id, sha256 of
+the text) and only sends the misses to the model.
+
+Backed by a single SQLite file (stdlib, no server, safe across processes);
+vectors are stored as raw float32 blobs. Embeddings are cached before any
+PCA projection, so changing PCA_DIM doesn't invalidate them.
+"""
+
+import logging
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from . import metrics
+from .config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_MODEL,
+    EMBEDDING_ONNX_QUANTIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Keys per SELECT ... IN (...) — well under SQLite's host-parameter limit.
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model     TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector    BLOB NOT NULL,
+    PRIMARY KEY (model, text_hash)
+) WITHOUT ROWID
+"""
+
+
+def encoder_id() -> str:
+    """
+    Identifies the vectors an encoder produces: the model plus anything that
+    changes its output (ONNX int8 weights differ slightly from float ones).
+    """
+    if EMBEDDING_BACKEND == "onnx" and EMBEDDING_ONNX_QUANTIZE:
+        return f"{EMBEDDING_MODEL}:onnx-qint8"
+    return EMBEDDING_MODEL
+
+
+class EmbeddingCache:
+    """(model id, text hash) → float32 vector, in a SQLite file."""
+
+    def __init__(self, path: Path, model_id: str) -> None:
+        self.path = path
+        self.model_id = model_id
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per call: ingest is infrequent and may run on
+        # different threads (startup thread, request handler).
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, text_hashes: list[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for whichever of text_hashes are present."""
+        found: dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(text_hashes))
+        with self._connect() as conn:
+            for start in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[start:start + _LOOKUP_BATCH]
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({','.join('?' * len(batch))})",
+                    [self.model_id, *batch],
+                )
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+        metrics.counter("embedding_disk_cache_hits").inc(len(found))
+        metrics.counter("embedding_disk_cache_misses").inc(len(unique) - len(found))
+        return found
+
+    def put_many(self, text_hashes: list[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(self.model_id, h, v.tobytes()) for h, v in zip(text_hashes, vectors)],
+            )
+
+
+# ─── Module-level singleton ──────────────────────────────────────────────────
+
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """The on-disk embedding cache, or None when EMBEDDING_CACHE_PATH is empty."""
+    global _embedding_cache
+    if _embedding_cache is None and EMBEDDING_CACHE_PATH:
+        _embedding_cache = EmbeddingCache(Path(EMBEDDING_CACHE_PATH), encoder_id())
+        logger.info(f"Embedding disk cache: {EMBEDDING_CACHE_PATH} ({_embedding_cache.model_id})")
+    return _embedding_cache
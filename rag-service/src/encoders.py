@@ -0,0 +1,303 @@
+"""
+Embedding encoders — everything that turns text into vectors.
+
+get_embedding_model() in ingest.py returns one of these, chosen by
+EMBEDDING_BACKEND. All of them expose the SentenceTransformer-style
+encode(sentences, batch_size=..., show_progress_bar=...) → np.ndarray, so
+ingest and retrieval don't care which is behind it.
+
+  torch — sentence-transformers on PyTorch (the reference implementation).
+  onnx  — the same model exported to ONNX and run by ONNX Runtime: no torch
+          import, a faster CPU inference path, and optional dynamic int8
+          weight quantization. Pooling and normalization follow the model's
+          sentence-transformers config, so its embeddings are compatible with
+          an index built by the torch backend.
+
+For queries only, QUERY_ENCODER=static swaps in a StaticEncoder: a lookup
+table of per-token vectors distilled from the full model, mean-pooled per
+query. Encoding takes microseconds and needs only numpy + tokenizers, at the
+cost of some retrieval quality (benchmarks/static_encoder.py measures it).
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Callable, Protocol
+
+import numpy as np
+
+from .config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    EMBEDDING_ONNX_DIR,
+    EMBEDDING_ONNX_QUANTIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Encoder(Protocol):
+    """What ingest and retrieval need from an embedding model."""
+
+    def encode(self, sentences: list[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray: ...
+
+
+# ─── ONNX Runtime ─────────────────────────────────────────────────────────────
+
+# Files needed to run a sentence-transformers model without torch.
+_ONNX_FILES = [
+    "tokenizer.json",
+    "onnx/model.onnx",
+    "modules.json",
+    "sentence_bert_config.json",
+    "1_Pooling/config.json",
+]
+
+
+def _hub_repo_id(model_name: str) -> str:
+    """Bare sentence-transformers names (all-MiniLM-L6-v2) live under that org on the Hub."""
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def _read_json(path: Path) -> dict | list:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+class OnnxEncoder:
+    """
+    Sentence encoder running an ONNX export through ONNX Runtime.
+
+    Reproduces the sentence-transformers pipeline: tokenize (truncating to the
+    model's max_seq_length) → transformer → pool (mean or CLS, per the model's
+    pooling config) → L2-normalize if the model has a Normalize module.
+    """
+
+    def __init__(self, model_dir: Path, quantize: bool = False, threads: int | None = None) -> None:
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.model_dir = model_dir
+        st_config = _read_json(model_dir / "sentence_bert_config.json")
+        pooling = _read_json(model_dir / "1_Pooling" / "config.json")
+        modules = _read_json(model_dir / "modules.json")
+
+        self.max_seq_length = st_config.get("max_seq_length", 256)
+        self.pooling = "cls" if pooling.get("pooling_mode_cls_token") else "mean"
+        self.normalize = any(m.get("type", "").endswith("Normalize") for m in modules)
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding()
+
+        model_path = model_dir / "onnx" / "model.onnx"
+        if quantize:
+            model_path = self._quantized(model_path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            # ONNX Runtime ignores OMP_NUM_THREADS; unset, it uses every physical core
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        logger.info(f"ONNX encoder: {model_path} ({self.pooling} pooling, normalize={self.normalize})")
+
+    @staticmethod
+    def _quantized(model_path: Path) -> Path:
+        """Dynamically quantize weights to int8 once, caching the result next to the model."""
+        quantized_path = model_path.with_name("model_qint8.onnx")
+        if not quantized_path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info(f"Quantizing {model_path.name} → {quantized_path.name} (dynamic int8)")
+            quantize_dynamic(str(model_path), str(quantized_path), weight_type=QuantType.QInt8)
+        return quantized_path
+
+    def encode(self, sentences: list[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate([
+            self._encode_batch(sentences[start:start + batch_size])
+            for start in range(0, len(sentences), batch_size)
+        ])
+
+    def _encode_batch(self, sentences: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(sentences)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        if self.pooling == "cls":
+            pooled = token_embeddings[:, 0]
+        else:
+            mask = attention_mask[:, :, np.newaxis].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.normalize:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+
+def _onnx_model_dir(model_name: str) -> Path:
+    """Local ONNX export: EMBEDDING_ONNX_DIR if set, else downloaded from the Hub."""
+    if EMBEDDING_ONNX_DIR:
+        return Path(EMBEDDING_ONNX_DIR)
+    from huggingface_hub import snapshot_download
+
+    return Path(snapshot_download(_hub_repo_id(model_name), allow_patterns=_ONNX_FILES))
+
+
+# ─── Token lengths ───────────────────────────────────────────────────────────
+
+
+def _backend_tokenizer(encoder: Encoder):
+    """The `tokenizers.Tokenizer` behind a torch, ONNX or static encoder."""
+    tokenizer = encoder.tokenizer
+    return getattr(tokenizer, "backend_tokenizer", tokenizer)
+
+
+def token_lengths(encoder: Encoder, texts: list[str]) -> np.ndarray:
+    """Model input length of each text in tokens (special tokens included, truncation applied)."""
+    encodings = _backend_tokenizer(encoder).encode_batch(texts)
+    lengths = np.array([sum(e.attention_mask) for e in encodings], dtype=np.int64)
+    max_seq_length = getattr(encoder, "max_seq_length", None)
+    return np.minimum(lengths, max_seq_length) if max_seq_length else lengths
+
+
+def padding_ratio(lengths: np.ndarray, batch_size: int) -> float:
+    """
+    Share of token slots that are padding when lengths are encoded in order,
+    batch_size at a time, each batch padded to its longest member.
+    """
+    padded = real = 0
+    for start in range(0, len(lengths), batch_size):
+        batch = lengths[start:start + batch_size]
+        padded += int(batch.max()) * len(batch)
+        real += int(batch.sum())
+    return 1.0 - real / padded if padded else 0.0
+
+
+# ─── Static lookup table ──────────────────────────────────────────────────────
+
+STATIC_TABLE_FILE = "static_table.npy"
+STATIC_TOKENIZER_FILE = "tokenizer.json"
+# Which model the table was distilled from, and its dimension.
+STATIC_MANIFEST_FILE = "static_encoder.json"
+
+
+class StaticEncoder:
+    """
+    Query encoder: tokenize → look up one vector per token → mean → normalize.
+
+    The table has one row per vocabulary entry, each the full model's
+    embedding of that token on its own (see distill_static_encoder). No
+    attention, no torch — a query costs a tokenizer call and a gather.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        from tokenizers import Tokenizer
+
+        self.table = np.load(directory / STATIC_TABLE_FILE)
+        self.tokenizer = Tokenizer.from_file(str(directory / STATIC_TOKENIZER_FILE))
+        self.tokenizer.no_padding()
+        self.tokenizer.no_truncation()
+        logger.info(f"Static encoder: {self.table.shape[0]} tokens × {self.table.shape[1]} dims")
+
+    def encode(self, sentences: list[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        out = np.zeros((len(sentences), self.table.shape[1]), dtype=np.float32)
+        for i, encoding in enumerate(self.tokenizer.encode_batch(sentences, add_special_tokens=False)):
+            if encoding.ids:
+                out[i] = self.table[encoding.ids].mean(axis=0)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+def _token_text(token: str) -> str:
+    """Surface text of a vocab entry (drop WordPiece / BPE / SentencePiece markers)."""
+    for marker in ("##", "Ġ", "▁"):
+        if token.startswith(marker):
+            return token[len(marker):] or token
+    return token
+
+
+def distill_static_encoder(encoder: Encoder, directory: Path, model_id: str, batch_size: int = 256) -> StaticEncoder:
+    """
+    Build a StaticEncoder from a full encoder and save it to directory.
+
+    Every vocabulary entry is embedded on its own by the full model; special
+    tokens get zero rows so they never contribute to a query's mean.
+    """
+    tokenizer = _backend_tokenizer(encoder)
+    vocab = tokenizer.get_vocab()
+    special = {t.content for t in tokenizer.get_added_tokens_decoder().values() if t.special}
+
+    ids = [i for token, i in vocab.items() if token not in special]
+    texts = [_token_text(token) for token, i in vocab.items() if token not in special]
+    logger.info(f"Distilling static encoder from {len(texts)} vocabulary tokens...")
+    vectors = encoder.encode(texts, batch_size=batch_size, show_progress_bar=False)
+
+    table = np.zeros((max(vocab.values()) + 1, vectors.shape[1]), dtype=np.float32)
+    table[ids] = vectors
+
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / STATIC_TABLE_FILE, table)
+    tokenizer.save(str(directory / STATIC_TOKENIZER_FILE))
+    (directory / STATIC_MANIFEST_FILE).write_text(json.dumps({"model": model_id, "dim": int(table.shape[1])}))
+    logger.info(f"Static encoder saved to {directory}")
+    return StaticEncoder(directory)
+
+
+def load_static_encoder(
+    directory: Path,
+    full_encoder: Callable[[], Encoder],
+    model_id: str = EMBEDDING_MODEL,
+) -> StaticEncoder:
+    """
+    Load the static table from directory, distilling it from the full model
+    if missing — or if it was distilled from another model, whose vector
+    space queries must not be matched against.
+    """
+    if (directory / STATIC_TABLE_FILE).exists():
+        manifest = _read_json(directory / STATIC_MANIFEST_FILE)
+        if manifest.get("model") == model_id:
+            encoder = StaticEncoder(directory)
+            if encoder.table.shape[1] == manifest.get("dim"):
+                return encoder
+        logger.info(
+            f"Static table in {directory} was distilled from {manifest.get('model') or 'an unrecorded model'} — "
+            f"re-distilling from {model_id}"
+        )
+    return distill_static_encoder(full_encoder(), directory, model_id)
+
+
+# ─── Factory ──────────────────────────────────────────────────────────────────
+
+def load_encoder(
+    backend: str = EMBEDDING_BACKEND,
+    model_name: str = EMBEDDING_MODEL,
+    threads: int | None = None,
+) -> Encoder:
+    """
+    Instantiate the encoder for the given backend (downloads on first use).
+
+    threads caps ONNX Runtime's intra-op pool (torch is capped by the caller,
+    via torch.set_num_threads); None leaves the runtime's default.
+    """
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(model_name)
+    if backend == "onnx":
+        return OnnxEncoder(_onnx_model_dir(model_name), quantize=EMBEDDING_ONNX_QUANTIZE, threads=threads)
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend!r}")
@@ -0,0 +1,95 @@
+"""
+Bounded executor for search work.
+
+Search is synchronous (model.encode + vector query), so running it inside an
+async endpoint blocks the event loop — including /health. This module runs it
+on a dedicated thread pool with an admission limit: once every worker is busy
+and the wait queue is full, new work is rejected immediately so the API can
+answer 503 instead of letting latency grow without bound.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from .config import SEARCH_QUEUE_SIZE, SEARCH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorOverloadedError(Exception):
+    """Raised when the executor is at capacity and cannot admit more work."""
+
+
+class BoundedExecutor:
+    """Thread pool that admits at most `workers + queue_size` pending tasks."""
+
+    def __init__(self, workers: int, queue_size: int, name: str) -> None:
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Tasks admitted but not yet finished (running + queued)."""
+        return self._pending
+
+    def _admit(self) -> bool:
+        with self._lock:
+            if self._pending >= self.capacity:
+                return False
+            self._pending += 1
+            return True
+
+    def _release(self, _future: object = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., T], *args: object) -> T:
+        """
+        Run fn(*args) on the pool and await its result.
+
+        Raises ExecutorOverloadedError without queueing if at capacity.
+        The admission slot is released when the work itself finishes, not when
+        the awaiting request goes away, so cancelled requests can't overbook.
+        """
+        if not self._admit():
+            raise ExecutorOverloadedError(f"{self.capacity} tasks already pending")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ─── Module-level singleton ──────────────────────────────────────────────────
+
+_search_executor: BoundedExecutor | None = None
+
+
+def get_search_executor() -> BoundedExecutor:
+    """Get or create the executor that runs /search work."""
+    global _search_executor
+    if _search_executor is None:
+        _search_executor = BoundedExecutor(SEARCH_WORKERS, SEARCH_QUEUE_SIZE, name="search")
+        logger.info(f"Search executor: {SEARCH_WORKERS} workers, queue of {SEARCH_QUEUE_SIZE}")
+    return _search_executor
+
+
+def shutdown_search_executor() -> None:
+    """Stop the search executor (called on app shutdown)."""
+    global _search_executor
+    if _search_executor is not None:
+        _search_executor.shutdown()
+        _search_executor = None
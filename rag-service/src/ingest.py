@@ -1,64 +1,265 @@
 """
-Ingest pipeline: load markdown docs → chunk → embed → store in ChromaDB.
+Ingest pipeline: load markdown docs → chunk → embed → store in the vector store.
 
 The chunking strategy uses character-based splitting with overlap.
 Each chunk carries metadata (source filename, chunk index) so the retriever
 can tell the agent which policy document the answer came from.
 """
 
+import hashlib
+import json
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Collection
 
-import chromadb
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
+from . import metrics
 from .config import (
     CHUNK_SIZE,
     CHUNK_OVERLAP,
-    CHROMA_COLLECTION,
     CHROMA_PERSIST_DIR,
+    EMBEDDING_BACKEND,
     EMBEDDING_MODEL,
+    HNSW_CONSTRUCTION_EF,
+    HNSW_M,
+    INGEST_BATCH_SIZE,
+    INGEST_LENGTH_BUCKETING,
+    INGEST_SHARD_SIZE,
+    INGEST_WORKERS,
+    INDEX_ROLLBACK_GRACE_SECONDS,
+    PCA_DIM,
     POLICIES_DIR,
+    QUERY_ENCODER,
+    STATIC_ENCODER_DIR,
+    VECTOR_BACKEND,
+)
+from .embed_pool import get_embedding_pool
+from .embedding_cache import get_embedding_cache
+from .encoders import Encoder, load_encoder, load_static_encoder, padding_ratio, token_lengths
+from .pca import PCAProjection
+from .vector_store import (
+    VectorStore,
+    create_vector_store,
+    delete_stale_collections,
+    open_chroma_collection,
+    open_persisted_store,
+    read_alias,
+    write_alias,
 )
 
 logger = logging.getLogger(__name__)
 
 # ─── Module-level singletons ─────────────────────────────────────────────────
 
-_chroma_client: chromadb.ClientAPI | None = None
-_embedding_model: SentenceTransformer | None = None
+_embedding_model: Encoder | None = None
+_query_encoder: Encoder | None = None
 
 
-def get_chroma_client() -> chromadb.ClientAPI:
-    """Get or create the ChromaDB client (in-memory or persistent)."""
-    global _chroma_client
-    if _chroma_client is None:
-        if CHROMA_PERSIST_DIR:
-            _chroma_client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
-            logger.info(f"ChromaDB persistent client at {CHROMA_PERSIST_DIR}")
-        else:
-            _chroma_client = chromadb.Client()
-            logger.info("ChromaDB in-memory client")
-    return _chroma_client
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """
+    Point-in-time view of the index, published by the ingest path.
+
+    The search hot path reads everything it needs from here — store handle,
+    chunk count, version, and the PCA projection the stored vectors were
+    reduced with (queries must be projected the same way) — so it never
+    makes a metadata round trip to the vector store. The version is bumped
+    on every ingest and caches key on it, so nothing computed against an
+    older policy set can be served once a new ingest has landed.
+    """
+    store: VectorStore | None
+    chunk_count: int
+    version: int
+    projection: PCAProjection | None = None
+
+
+_snapshot = IndexSnapshot(store=None, chunk_count=0, version=0)
+_snapshot_lock = threading.Lock()
 
 
-def get_embedding_model() -> SentenceTransformer:
+def get_embedding_model() -> Encoder:
     """Get or create the embedding model (downloads on first use)."""
     global _embedding_model
     if _embedding_model is None:
-        logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
-        _embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+        logger.info(f"Loading embedding model: {EMBEDDING_MODEL} ({EMBEDDING_BACKEND} backend)")
+        _embedding_model = load_encoder()
         logger.info("Embedding model loaded")
     return _embedding_model
 
 
-def get_collection() -> chromadb.Collection:
-    """Get the ChromaDB collection, creating it if needed."""
-    client = get_chroma_client()
-    return client.get_or_create_collection(
-        name=CHROMA_COLLECTION,
-        metadata={"hnsw:space": "cosine"},
+def get_query_encoder() -> Encoder:
+    """Encoder for search queries — the embedding model, or its static distillation."""
+    global _query_encoder
+    if _query_encoder is None:
+        if QUERY_ENCODER == "static":
+            _query_encoder = load_static_encoder(STATIC_ENCODER_DIR, get_embedding_model)
+        elif QUERY_ENCODER == "model":
+            _query_encoder = get_embedding_model()
+        else:
+            raise ValueError(f"Unknown QUERY_ENCODER: {QUERY_ENCODER!r}")
+    return _query_encoder
+
+
+def get_index_snapshot() -> IndexSnapshot:
+    """The current index snapshot (replaced atomically by each ingest)."""
+    return _snapshot
+
+
+def _publish_snapshot(
+    store: VectorStore,
+    chunk_count: int,
+    projection: PCAProjection | None = None,
+) -> IndexSnapshot:
+    """Install a new store handle + count + projection and bump the version."""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = IndexSnapshot(
+            store=store,
+            chunk_count=chunk_count,
+            version=_snapshot.version + 1,
+            projection=projection,
+        )
+        return _snapshot
+
+
+def get_pca_path(store: VectorStore) -> Path | None:
+    """Where a store's PCA projection is persisted (None for in-memory indexes)."""
+    if not CHROMA_PERSIST_DIR or store.backend != "chroma":
+        return None
+    return Path(CHROMA_PERSIST_DIR) / f"{store.name}.pca.npz"
+
+
+def _load_projection(store: VectorStore) -> PCAProjection | None:
+    """
+    The store's persisted PCA projection, if it was built with PCA. Its
+    output_dim can be below the recorded pca_dim (fit caps it at the chunk
+    count and input dimension); a PCA_DIM change shows in the store's
+    settings, and _can_update rebuilds on that.
+    """
+    path = get_pca_path(store)
+    pca_dim = (store.get_settings() or {}).get("pca_dim", PCA_DIM)
+    if pca_dim <= 0 or path is None or not path.exists():
+        return None
+    return PCAProjection.load(path)
+
+
+def _fit_projection(embeddings: np.ndarray, store: VectorStore) -> PCAProjection | None:
+    """Fit (and persist alongside store) the PCA projection when PCA_DIM is enabled."""
+    if PCA_DIM <= 0:
+        return None
+    projection = PCAProjection.fit(embeddings, PCA_DIM)
+    logger.info(
+        f"PCA {projection.input_dim} → {projection.output_dim} dims, "
+        f"{projection.variance_retained:.1%} variance retained"
     )
+    metrics.gauge("pca_variance_retained").set(round(projection.variance_retained, 4))
+    path = get_pca_path(store)
+    if path is not None:
+        projection.save(path)
+    return projection
+
+
+# ─── Blue/green promotion ────────────────────────────────────────────────────
+#
+# A full rebuild goes into a brand-new store; the live one keeps serving
+# until _promote swaps the snapshot. The replaced snapshot is retained as
+# _previous for INDEX_ROLLBACK_GRACE_SECONDS, so rollback_index() can swap it
+# straight back, then dropped. Only one previous version is kept.
+
+_previous: IndexSnapshot | None = None
+_promote_lock = threading.Lock()
+
+
+def _drop_store(store: VectorStore) -> None:
+    store.drop()
+    path = get_pca_path(store)
+    if path is not None:
+        path.unlink(missing_ok=True)
+
+
+def _retire(snapshot: IndexSnapshot | None, grace_seconds: float = INDEX_ROLLBACK_GRACE_SECONDS) -> None:
+    """Keep snapshot as the rollback target, dropping whatever was there before."""
+    global _previous
+    replaced, _previous = _previous, snapshot
+    if replaced is not None and replaced.store is not None and (snapshot is None or replaced.store is not snapshot.store):
+        _drop_store(replaced.store)
+    if snapshot is not None:
+        timer = threading.Timer(grace_seconds, _expire_previous, args=(snapshot,))
+        timer.daemon = True
+        timer.start()
+
+
+def _expire_previous(snapshot: IndexSnapshot) -> None:
+    """Grace period over: drop snapshot's store if it is still the rollback target."""
+    global _previous
+    with _promote_lock:
+        if _previous is not snapshot:
+            return
+        _previous = None
+        live = get_index_snapshot().store
+        if live is not None:
+            write_alias(live.name, None)
+        _drop_store(snapshot.store)
+        logger.info(f"Rollback window over — dropped previous index {snapshot.store.name}")
+
+
+def _promote(store: VectorStore, chunk_count: int, projection: PCAProjection | None) -> IndexSnapshot:
+    """Flip searches (and the persisted alias) to a freshly built store."""
+    with _promote_lock:
+        old = get_index_snapshot()
+        snapshot = _publish_snapshot(store, chunk_count, projection)
+        keep = old if old.store is not None and old.store is not store else None
+        write_alias(store.name, keep.store.name if keep is not None else None)
+        _retire(keep)
+        return snapshot
+
+
+def rollback_index() -> IndexSnapshot:
+    """
+    Swap the previous index version back in.
+
+    The version being rolled back becomes the new rollback target, so a
+    rollback can itself be undone within the grace period. Raises
+    LookupError if there is no previous version (none yet, or expired).
+    """
+    global _previous
+    with _promote_lock:
+        previous = _previous
+        if previous is None:
+            raise LookupError("No previous index version to roll back to")
+        current = get_index_snapshot()
+        snapshot = _publish_snapshot(previous.store, previous.chunk_count, previous.projection)
+        write_alias(previous.store.name, current.store.name)
+        _previous = None
+        _retire(current)
+    logger.info(f"Rolled back index to {previous.store.name} ({snapshot.chunk_count} chunks, version {snapshot.version})")
+    metrics.counter("index_rollbacks").inc()
+    return snapshot
+
+
+def _restore_previous() -> None:
+    """
+    After a restart: re-arm rollback to the alias's previous collection if
+    it is still within its window, and drop every other collection under the
+    alias (expired previous versions, orphans of interrupted builds).
+    """
+    alias = read_alias()
+    remaining = alias.get("promoted_at", 0) + INDEX_ROLLBACK_GRACE_SECONDS - time.time()
+    name = alias.get("previous")
+    store = open_chroma_collection(name) if name and remaining > 0 else None
+    keep = {alias["live"]} if alias.get("live") else set()
+    if store is not None:
+        keep.add(name)
+        with _promote_lock:
+            _retire(
+                IndexSnapshot(store=store, chunk_count=store.count(), version=0, projection=_load_projection(store)),
+                remaining,
+            )
+    delete_stale_collections(keep)
 
 
 # ─── Chunking ────────────────────────────────────────────────────────────────
@@ -100,11 +301,158 @@ def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVE
     return chunks
 
 
+# ─── Progress ────────────────────────────────────────────────────────────────
+
+
+class IngestProgress:
+    """
+    Live progress of one ingest: the current phase and how many of the
+    chunks that need embedding are done. Written by the ingest thread, read
+    by GET /ingest/{id}; single attribute writes, so no lock is needed.
+    """
+
+    def __init__(self) -> None:
+        self.phase = "queued"
+        self.chunks_total = 0
+        self.chunks_embedded = 0
+        self.embedding_started: float | None = None
+
+    def set_phase(self, phase: str) -> None:
+        self.phase = phase
+
+    def start_embedding(self, total: int) -> None:
+        self.phase = "embedding"
+        self.chunks_total = total
+        self.chunks_embedded = 0
+        self.embedding_started = time.monotonic()
+
+    def advance(self, chunks: int) -> None:
+        self.chunks_embedded += chunks
+
+    @property
+    def chunks_per_second(self) -> float | None:
+        if self.embedding_started is None:
+            return None
+        elapsed = time.monotonic() - self.embedding_started
+        return self.chunks_embedded / elapsed if elapsed > 0 else None
+
+    @property
+    def eta_seconds(self) -> float | None:
+        """Time left in the embedding phase at the current rate (None until measurable)."""
+        rate = self.chunks_per_second
+        if self.phase != "embedding" or not rate:
+            return None
+        return (self.chunks_total - self.chunks_embedded) / rate
+
+
+# ─── Embedding ───────────────────────────────────────────────────────────────
+
+
+def embed_chunks(chunks: list[str], progress: IngestProgress | None = None) -> np.ndarray:
+    """
+    Embed chunk texts, returning rows in the same order as chunks.
+
+    Vectors already in the on-disk embedding cache are reused; only the
+    misses are encoded (and then added to the cache).
+    """
+    progress = progress or IngestProgress()
+    progress.start_embedding(len(chunks))
+    cache = get_embedding_cache()
+    if cache is None or not chunks:
+        return _encode_chunks(chunks, progress)
+
+    hashes = [_content_hash(chunk) for chunk in chunks]
+    found = cache.get_many(hashes)
+    missing = [i for i, h in enumerate(hashes) if h not in found]
+    logger.info(f"Embedding cache: {len(chunks) - len(missing)} of {len(chunks)} chunks cached")
+    progress.advance(len(chunks) - len(missing))
+    if missing:
+        encoded = _encode_chunks([chunks[i] for i in missing], progress)
+        cache.put_many([hashes[i] for i in missing], encoded)
+        found.update(zip((hashes[i] for i in missing), encoded))
+    return np.stack([found[h] for h in hashes]).astype(np.float32, copy=False)
+
+
+def _encode_chunks(chunks: list[str], progress: IngestProgress) -> np.ndarray:
+    """
+    Run the embedding model over chunks, returning rows in the same order.
+
+    With INGEST_LENGTH_BUCKETING the chunks are encoded shortest-first, so
+    every batch pads to a length close to its members' own; the inverse
+    permutation puts the embeddings back. Encoding runs across the process
+    pool when INGEST_WORKERS is enabled and the corpus spans several shards,
+    else in-process — either way INGEST_SHARD_SIZE chunks at a time, so
+    progress advances as each shard completes.
+    """
+    started = time.perf_counter()
+    model = get_embedding_model()
+    lengths = token_lengths(model, chunks)
+    order = np.argsort(lengths, kind="stable") if INGEST_LENGTH_BUCKETING else np.arange(len(chunks))
+    ordered = [chunks[i] for i in order]
+
+    if INGEST_WORKERS > 1 and len(chunks) > INGEST_SHARD_SIZE:
+        logger.info(f"Embedding {len(chunks)} chunks across {INGEST_WORKERS} worker processes...")
+        shards = get_embedding_pool().iter_encode(ordered, batch_size=INGEST_BATCH_SIZE)
+    else:
+        logger.info(f"Embedding {len(chunks)} chunks...")
+        shards = (
+            model.encode(ordered[start:start + INGEST_SHARD_SIZE], batch_size=INGEST_BATCH_SIZE, show_progress_bar=False)
+            for start in range(0, len(ordered), INGEST_SHARD_SIZE)
+        )
+
+    parts: list[np.ndarray] = []
+    for shard in shards:
+        parts.append(np.asarray(shard, dtype=np.float32))
+        progress.advance(len(shard))
+    encoded = np.concatenate(parts) if parts else np.empty((0, 0), dtype=np.float32)
+
+    embeddings = np.empty_like(encoded)
+    embeddings[order] = encoded
+
+    padding = padding_ratio(lengths[order], INGEST_BATCH_SIZE)
+    rate = len(chunks) / max(time.perf_counter() - started, 1e-9)
+    logger.info(f"Embedded {len(chunks)} chunks at {rate:.0f} chunks/s ({padding:.1%} padding)")
+    metrics.gauge("ingest_padding_ratio").set(round(padding, 4))
+    metrics.gauge("ingest_chunks_per_second").set(round(rate, 1))
+    return embeddings
+
+
 # ─── Ingestion ────────────────────────────────────────────────────────────────
 
 
-def load_documents(policies_dir: Path = POLICIES_DIR) -> list[tuple[str, str]]:
-    """Load all markdown files from the policies directory.
+def corpus_fingerprint(docs: list[tuple[str, str]]) -> str:
+    """
+    Hash of everything the stored vectors depend on: each file's name and
+    content hash, the chunking parameters, the embedding model and PCA_DIM.
+    """
+    return _fingerprint({filename: _content_hash(content) for filename, content in docs})
+
+
+def _index_settings() -> dict:
+    """Settings the stored vectors depend on; a store built with others needs a full rebuild."""
+    return {
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "embedding_model": EMBEDDING_MODEL,
+        "pca_dim": PCA_DIM,
+        # HNSW graph shape (chroma); search_ef is applied in place instead
+        "hnsw_m": HNSW_M,
+        "hnsw_construction_ef": HNSW_CONSTRUCTION_EF,
+    }
+
+
+def _fingerprint(file_hashes: dict[str, str]) -> str:
+    """corpus_fingerprint from file name → content hash (also read back from chunk metadata)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(_index_settings(), sort_keys=True).encode())
+    for filename, file_hash in sorted(file_hashes.items()):
+        digest.update(f"\n{filename}\0".encode())
+        digest.update(bytes.fromhex(file_hash))
+    return digest.hexdigest()
+
+
+def load_documents(policies_dir: Path = POLICIES_DIR, files: Collection[str] | None = None) -> list[tuple[str, str]]:
+    """Load all markdown files from the policies directory (or just the named ones that exist).
 
     Returns list of (filename, content) tuples.
     """
@@ -113,7 +461,10 @@ def load_documents(policies_dir: Path = POLICIES_DIR) -> list[tuple[str, str]]:
         logger.warning(f"Policies directory not found: {policies_dir}")
         return docs
 
-    for md_file in sorted(policies_dir.glob("*.md")):
+    md_files = policies_dir.glob("*.md") if files is None else (
+        policies_dir / name for name in files if name.endswith(".md") and (policies_dir / name).is_file()
+    )
+    for md_file in sorted(md_files):
         content = md_file.read_text(encoding="utf-8")
         docs.append((md_file.name, content))
         logger.info(f"Loaded {md_file.name} ({len(content)} chars)")
@@ -121,59 +472,322 @@ def load_documents(policies_dir: Path = POLICIES_DIR) -> list[tuple[str, str]]:
     return docs
 
 
-def ingest_documents(policies_dir: Path = POLICIES_DIR) -> tuple[int, int]:
+@dataclass(frozen=True)
+class IngestStats:
+    """Outcome of an ingest: corpus size plus what changed in the index."""
+    documents: int
+    chunks: int
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _chunk_hash(chunk: str) -> str:
+    """Hash of a chunk as embedded — covers the model and PCA_DIM, not just the text."""
+    return _content_hash(f"{EMBEDDING_MODEL}\0{PCA_DIM}\0{chunk}")
+
+
+def _chunk_document(filename: str, content: str) -> tuple[list[str], list[str], list[dict[str, str]]]:
+    """Chunk one document into (ids, texts, metadatas), tagging each chunk with content hashes."""
+    file_hash = _content_hash(content)
+    ids: list[str] = []
+    texts: list[str] = []
+    metadatas: list[dict[str, str]] = []
+    for i, chunk in enumerate(chunk_text(content)):
+        ids.append(f"{filename}::chunk_{i}")
+        texts.append(chunk)
+        metadatas.append({
+            "source": filename,
+            "chunk_index": str(i),
+            "file_hash": file_hash,
+            "chunk_hash": _chunk_hash(chunk),
+        })
+    return ids, texts, metadatas
+
+
+# Attempts at an incremental ingest whose live index keeps being swapped under it.
+_MAX_INGEST_ATTEMPTS = 3
+
+
+class _LiveIndexChanged(Exception):
+    """The live index was swapped while an incremental ingest was preparing its changes."""
+
+
+def ingest_documents(
+    policies_dir: Path = POLICIES_DIR,
+    full: bool = False,
+    progress: IngestProgress | None = None,
+    files: Collection[str] | None = None,
+) -> IngestStats:
     """
-    Full ingest pipeline: load docs → chunk → embed → store.
+    Bring the index in line with the policy documents on disk.
+
+    By default this is incremental against the live index: only new or
+    edited chunks are embedded and upserted, and chunks whose document (or
+    tail) disappeared are deleted. full=True — or no live index yet — clears
+    the collection and re-embeds everything (refitting PCA if enabled).
+
+    files limits an incremental ingest to those file names (the policy
+    watcher passes the ones it saw change): only they are read and diffed,
+    a name that no longer exists has its chunks removed, and every other
+    document is left as it is in the index. Ignored when a rebuild is due.
 
-    Returns (documents_processed, total_chunks).
-    Clears existing collection data first for idempotent re-ingestion.
+    progress, if given, is updated as the ingest moves through its phases.
     """
-    model = get_embedding_model()
-    client = get_chroma_client()
-
-    # Delete and recreate collection for clean re-ingestion
-    try:
-        client.delete_collection(CHROMA_COLLECTION)
-        logger.info(f"Cleared existing collection: {CHROMA_COLLECTION}")
-    except Exception:
-        pass  # Collection doesn't exist yet
-
-    collection = client.get_or_create_collection(
-        name=CHROMA_COLLECTION,
-        metadata={"hnsw:space": "cosine"},
-    )
+    progress = progress or IngestProgress()
+    progress.set_phase("loading")
+    for _ in range(_MAX_INGEST_ATTEMPTS):
+        snapshot = get_index_snapshot()
+        store = snapshot.store if not full and _can_update(snapshot.store, snapshot.projection) else None
+        try:
+            if files is not None and store is not None:
+                docs = load_documents(policies_dir, files)
+                return _ingest(docs, store, snapshot.projection, progress, files=set(files), live=snapshot.store)
+            return _ingest(load_documents(policies_dir), store, snapshot.projection, progress, live=snapshot.store)
+        except _LiveIndexChanged as e:
+            # Redo the diff against whatever is live now; the chunks just
+            # embedded are mostly disk-cache hits the second time.
+            logger.info(f"Live index changed during the incremental ingest into {e} — redoing it")
+            metrics.counter("ingest_retries").inc()
+    raise RuntimeError(f"Live index kept changing; gave up after {_MAX_INGEST_ATTEMPTS} attempts")
+
+
+def _ingest(
+    docs: list[tuple[str, str]],
+    store: VectorStore | None,
+    projection: PCAProjection | None,
+    progress: IngestProgress | None = None,
+    files: set[str] | None = None,
+    live: VectorStore | None = None,
+) -> IngestStats:
+    """
+    Rebuild, or update store incrementally. live is the store that was live
+    when store was picked (None at startup, before anything is published).
+    """
+    progress = progress or IngestProgress()
+    get_embedding_model()  # queries need it in-process, whatever INGEST_WORKERS is
+    if not _can_update(store, projection):
+        stats = _rebuild(docs, progress)
+    else:
+        stats = _update(store, projection, docs, progress, files, live)
+    progress.set_phase("done")
+    return stats
 
-    docs = load_documents(policies_dir)
+
+def _can_update(store: VectorStore | None, projection: PCAProjection | None) -> bool:
+    """
+    Whether store can be updated incrementally: it exists and was built with
+    the current settings (chunk hashes only cover new chunks, so a changed
+    model, PCA_DIM or chunking would otherwise leave stale vectors behind,
+    and HNSW M / construction_ef only take effect in a new collection).
+    """
+    if store is None:
+        return False
+    settings = store.get_settings()
+    if settings != _index_settings():
+        logger.info(f"Index was built with {settings or 'unrecorded settings'}, now {_index_settings()} — rebuilding")
+        return False
+    return PCA_DIM <= 0 or projection is not None
+
+
+def _rebuild(docs: list[tuple[str, str]], progress: IngestProgress) -> IngestStats:
+    """
+    Full ingest pipeline: chunk → embed → store, into a new store that
+    replaces the live one only once it is complete.
+    """
+    progress.set_phase("chunking")
+    store = create_vector_store()
     if not docs:
         logger.warning("No documents found to ingest")
-        return 0, 0
+        store.set_settings(_index_settings())
+        _promote(store, 0, None)
+        return IngestStats(documents=0, chunks=0)
 
     all_chunks: list[str] = []
     all_ids: list[str] = []
     all_metadatas: list[dict[str, str]] = []
 
     for filename, content in docs:
-        chunks = chunk_text(content)
-        for i, chunk in enumerate(chunks):
-            chunk_id = f"{filename}::chunk_{i}"
-            all_chunks.append(chunk)
-            all_ids.append(chunk_id)
-            all_metadatas.append({
-                "source": filename,
-                "chunk_index": str(i),
-            })
+        ids, chunks, metadatas = _chunk_document(filename, content)
+        all_ids.extend(ids)
+        all_chunks.extend(chunks)
+        all_metadatas.extend(metadatas)
 
     # Batch embed all chunks at once (more efficient than one-by-one)
-    logger.info(f"Embedding {len(all_chunks)} chunks...")
-    embeddings = model.encode(all_chunks, show_progress_bar=False).tolist()
+    embeddings = embed_chunks(all_chunks, progress)
+    progress.set_phase("storing")
+
+    # Optionally reduce dimensionality (queries get the same projection)
+    projection = _fit_projection(embeddings, store)
+    if projection is not None:
+        embeddings = projection.transform(embeddings)
 
-    # Store in ChromaDB
-    collection.add(
+    # Store in the vector index
+    store.add(
         ids=all_ids,
         documents=all_chunks,
         embeddings=embeddings,
         metadatas=all_metadatas,
     )
+    store.set_settings(_index_settings())
+    # Written last: a crash mid-ingest leaves no fingerprint, so no reuse
+    store.set_fingerprint(corpus_fingerprint(docs))
+    # Only now does search see the new store; the old one is kept for rollback
+    snapshot = _promote(store, len(all_chunks), projection)
+
+    logger.info(f"Ingested {len(docs)} documents → {len(all_chunks)} chunks (version {snapshot.version})")
+    return IngestStats(documents=len(docs), chunks=len(all_chunks), added=len(all_chunks))
+
+
+def _update(
+    store: VectorStore,
+    projection: PCAProjection | None,
+    docs: list[tuple[str, str]],
+    progress: IngestProgress,
+    files: set[str] | None = None,
+    live: VectorStore | None = None,
+) -> IngestStats:
+    """
+    Incremental ingest: diff the documents against the store's chunk hashes.
+
+    A document whose file hash matches every stored chunk of it is skipped
+    without re-chunking. Otherwise its chunks are compared by id: new ids are
+    added, ids whose chunk hash changed are updated, and only those two sets
+    are embedded; its unchanged chunks just get their metadata (file hash)
+    refreshed, so the file-level skip works for it next time. Stored ids no
+    longer produced by any document are removed.
+    The PCA projection (if any) is kept, not refitted.
+
+    With files, docs holds only those files and the diff is confined to
+    them: stored chunks of any other source are kept, and the corpus
+    fingerprint uses their file hashes from the chunk metadata.
+
+    Raises _LiveIndexChanged, before writing anything, if the live index is
+    no longer live — the store the caller saw live when it picked store (a
+    rollback or rebuild landed in between).
+    """
+    progress.set_phase("diffing")
+    stored = store.snapshot()
+    stored_by_source: dict[str, list[str]] = {}
+    for chunk_id, metadata in stored.items():
+        stored_by_source.setdefault(metadata.get("source", ""), []).append(chunk_id)
+
+    file_hashes: dict[str, str] = {}
+    if files is not None:
+        file_hashes = {
+            source: stored[ids[0]].get("file_hash", "")
+            for source, ids in stored_by_source.items()
+            if source not in files
+        }
+
+    current_ids: set[str] = set()
+    new_ids: list[str] = []
+    new_chunks: list[str] = []
+    new_metadatas: list[dict[str, str]] = []
+    refresh_ids: list[str] = []
+    refresh_metadatas: list[dict[str, str]] = []
+    added = updated = 0
 
-    logger.info(f"Ingested {len(docs)} documents → {len(all_chunks)} chunks")
-    return len(docs), len(all_chunks)
+    for filename, content in docs:
+        file_hash = _content_hash(content)
+        file_hashes[filename] = file_hash
+        existing = stored_by_source.get(filename, [])
+        if existing and all(stored[i].get("file_hash") == file_hash for i in existing):
+            current_ids.update(existing)
+            continue
+
+        ids, chunks, metadatas = _chunk_document(filename, content)
+        current_ids.update(ids)
+        for chunk_id, chunk, metadata in zip(ids, chunks, metadatas):
+            previous = stored.get(chunk_id)
+            if previous is not None and previous.get("chunk_hash") == metadata["chunk_hash"]:
+                if previous != metadata:
+                    refresh_ids.append(chunk_id)
+                    refresh_metadatas.append(metadata)
+                continue
+            if previous is None:
+                added += 1
+            else:
+                updated += 1
+            new_ids.append(chunk_id)
+            new_chunks.append(chunk)
+            new_metadatas.append(metadata)
+
+    removed_ids = [
+        chunk_id
+        for chunk_id, metadata in stored.items()
+        if chunk_id not in current_ids and (files is None or metadata.get("source") in files)
+    ]
+    fingerprint = _fingerprint(file_hashes)
+
+    embeddings = None
+    if new_ids:
+        embeddings = embed_chunks(new_chunks, progress)
+        if projection is not None:
+            embeddings = projection.transform(embeddings)
+    progress.set_phase("storing")
+
+    chunks = len(stored) + added - len(removed_ids)
+    stats = IngestStats(
+        documents=len(file_hashes),
+        chunks=chunks,
+        added=added,
+        updated=updated,
+        removed=len(removed_ids),
+        unchanged=chunks - added - updated,
+    )
+    # Writes and publish hold the promote lock, so a rollback can't swap the
+    # store out in between and have this re-publish the one it retired.
+    with _promote_lock:
+        if get_index_snapshot().store is not live:
+            raise _LiveIndexChanged(store.name)
+        if new_ids or removed_ids or refresh_ids or store.get_fingerprint() != fingerprint:
+            # Cleared first: an update interrupted part-way must not look current
+            store.set_fingerprint("")
+            if new_ids:
+                store.upsert(ids=new_ids, documents=new_chunks, embeddings=embeddings, metadatas=new_metadatas)
+            store.update_metadata(refresh_ids, refresh_metadatas)
+            store.delete(removed_ids)
+            store.set_fingerprint(fingerprint)
+        snapshot = _publish_snapshot(store, stats.chunks, projection)
+    logger.info(
+        f"Incremental ingest: {stats.added} added, {stats.updated} updated, {stats.removed} removed, "
+        f"{stats.unchanged} unchanged → {stats.chunks} chunks (version {snapshot.version})"
+    )
+    return stats
+
+
+def ensure_index(policies_dir: Path = POLICIES_DIR) -> IngestStats:
+    """
+    Startup entry point: reuse the persisted index when it was built from
+    exactly the current corpus and settings; otherwise bring it up to date
+    incrementally (or rebuild it from scratch if there is none, or it was
+    built with a different model, PCA_DIM, chunking or HNSW graph settings).
+    """
+    docs = load_documents(policies_dir)
+    if VECTOR_BACKEND == "chroma" and CHROMA_PERSIST_DIR:
+        _restore_previous()
+    store = open_persisted_store()
+    if store is None:
+        return _ingest(docs, None, None)
+
+    fingerprint = corpus_fingerprint(docs)
+    projection = _load_projection(store)
+    if not _can_update(store, projection):
+        return _ingest(docs, None, None)
+    if docs and store.get_fingerprint() == fingerprint:
+        snapshot = _publish_snapshot(store, store.count(), projection)
+        logger.info(
+            f"Persisted index matches the corpus ({fingerprint[:12]}) — "
+            f"reusing {snapshot.chunk_count} chunks, skipping ingest"
+        )
+        metrics.counter("ingest_skipped").inc()
+        return IngestStats(documents=len(docs), chunks=snapshot.chunk_count, unchanged=snapshot.chunk_count)
+
+    logger.info("Persisted index is missing or stale — updating it")
+    return _ingest(docs, store if store.count() else None, projection)
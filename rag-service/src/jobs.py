@@ -0,0 +1,146 @@
+"""
+Background ingest jobs.
+
+POST /ingest used to run the whole ingest inside the request. Now it submits
+a job and returns at once; GET /ingest/{id} reports the job's phase, chunks
+embedded, throughput and ETA (from its IngestProgress).
+
+Jobs run one at a time on a single worker thread. While one is running, at
+most one more waits behind it: further requests are coalesced into that
+queued job (it will read the policies directory when it starts, so it
+covers every change made before then) and get its id back. A queued job
+becomes a full rebuild if any of the requests it absorbed asked for one,
+and covers the whole directory unless all of them named specific files.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Collection
+
+from . import metrics
+from .ingest import IngestProgress, IngestStats, ingest_documents
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for GET /ingest/{id}; the oldest are forgotten first.
+MAX_FINISHED_JOBS = 100
+
+
+@dataclass
+class IngestJob:
+    """One ingest request (or several coalesced ones) and its outcome."""
+    id: str
+    full: bool
+    status: str = "queued"  # queued → running → succeeded | failed
+    progress: IngestProgress = field(default_factory=IngestProgress)
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    stats: IngestStats | None = None
+    error: str | None = None
+    coalesced: int = 0  # later requests folded into this job
+    files: set[str] | None = None  # only these policy files; None = the whole directory
+    changed_at: float | None = None  # earliest policy change this job makes searchable (watcher jobs)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+
+class IngestJobRunner:
+    """Runs ingest jobs sequentially, coalescing requests that arrive while one runs."""
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest")
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, IngestJob] = OrderedDict()
+        self._queued: IngestJob | None = None
+
+    def submit(
+        self,
+        full: bool = False,
+        files: Collection[str] | None = None,
+        changed_at: float | None = None,
+    ) -> IngestJob:
+        """Queue an ingest, or join the one already waiting to start."""
+        files = set(files) if files is not None else None
+        with self._lock:
+            queued = self._queued
+            if queued is not None:
+                queued.full = queued.full or full
+                queued.files = queued.files | files if queued.files is not None and files is not None else None
+                if changed_at is not None:
+                    queued.changed_at = min(queued.changed_at or changed_at, changed_at)
+                queued.coalesced += 1
+                metrics.counter("ingest_jobs_coalesced").inc()
+                return queued
+
+            job = IngestJob(id=uuid.uuid4().hex[:12], full=full, files=files, changed_at=changed_at)
+            self._jobs[job.id] = job
+            self._queued = job
+            self._forget_old_jobs()
+        self._executor.submit(self._run, job)
+        metrics.counter("ingest_jobs_submitted").inc()
+        return job
+
+    def get(self, job_id: str) -> IngestJob | None:
+        return self._jobs.get(job_id)
+
+    def _run(self, job: IngestJob) -> None:
+        with self._lock:
+            if self._queued is job:
+                self._queued = None
+            job.status = "running"
+            job.started_at = time.time()
+        scope = "full" if job.full else "incremental" if job.files is None else ", ".join(sorted(job.files))
+        logger.info(f"Ingest job {job.id} started ({scope})")
+        try:
+            job.stats = ingest_documents(full=job.full, progress=job.progress, files=job.files)
+            job.status = "succeeded"
+            if job.changed_at is not None:
+                # Index is published by now, so the change is searchable
+                latency = max(0.0, time.time() - job.changed_at)
+                metrics.summary("policy_change_to_searchable_seconds").observe(latency)
+        except Exception as e:
+            logger.exception(f"Ingest job {job.id} failed")
+            job.error = str(e)
+            job.progress.set_phase("failed")
+            job.status = "failed"
+            metrics.counter("ingest_jobs_failed").inc()
+        job.finished_at = time.time()
+        metrics.summary("ingest_job_seconds").observe(job.finished_at - job.started_at)
+        logger.info(f"Ingest job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+    def _forget_old_jobs(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ─── Module-level singleton ──────────────────────────────────────────────────
+
+_ingest_jobs: IngestJobRunner | None = None
+
+
+def get_ingest_jobs() -> IngestJobRunner:
+    """Get or create the background ingest job runner."""
+    global _ingest_jobs
+    if _ingest_jobs is None:
+        _ingest_jobs = IngestJobRunner()
+    return _ingest_jobs
+
+
+def shutdown_ingest_jobs() -> None:
+    """Stop accepting ingest jobs; a running one finishes on its own (called on app shutdown)."""
+    global _ingest_jobs
+    if _ingest_jobs is not None:
+        _ingest_jobs.shutdown()
+        _ingest_jobs = None
@@ -3,27 +3,66 @@ FastAPI app — the RAG microservice entry point.
 
 Endpoints:
   POST /search  — query policy documents (called by MCP policy_search tool)
-  POST /ingest  — re-ingest policy documents from disk
+  POST /search/batch — several searches in one round trip (one encode, one query)
+  POST /ingest  — start a background re-ingest of changed policy documents
+                  (?full=true rebuilds); 202 with a job id
+  GET  /ingest/{job_id} — ingest job phase, progress, throughput and ETA
+  POST /index/rollback — swap the previous index version back in
   GET  /health  — health check with collection stats
+  GET  /live    — liveness probe (answers as soon as the process is serving)
+  GET  /ready   — readiness probe (503 until startup ingest + warm-up finish)
+  GET  /metrics — in-process counters (batching, caching, load shedding)
 
-On startup, automatically ingests policy documents so the service is
-immediately ready to handle search queries.
+On startup, a background thread ingests policy documents (or reuses a
+persisted index already built from the same corpus) and warms up the
+encode + search path with WARMUP_QUERIES, so the first real search isn't a
+cold one. The server accepts connections immediately: /live answers right
+away, and search / ingest return 503 until /ready does.
+
+With POLICY_WATCH_ENABLED, edits to the policy files are picked up after
+that without calling /ingest (see watcher.py).
+
+Heavy dependencies (torch, sentence-transformers, chromadb, onnxruntime) are
+only imported by that startup work, never at module import — see
+benchmarks/startup.py for the per-module import report.
 """
 
 import logging
+import threading
+import time
 from contextlib import asynccontextmanager
+from typing import Annotated
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Body, FastAPI, HTTPException, Response
 
-from .config import CHROMA_COLLECTION, EMBEDDING_MODEL, HOST, PORT
-from .ingest import ingest_documents, get_collection
+from .config import (
+    CHROMA_COLLECTION,
+    EMBEDDING_MODEL,
+    HOST,
+    PORT,
+    SEARCH_BATCH_MAX_QUERIES,
+    SEARCH_RETRY_AFTER,
+    WARMUP_QUERIES,
+)
+from . import metrics
+from .batcher import shutdown_query_batcher
+from .embed_pool import shutdown_embedding_pool
+from .executor import ExecutorOverloadedError, get_search_executor, shutdown_search_executor
+from .ingest import IngestStats, ensure_index, rollback_index
+from .jobs import IngestJob, get_ingest_jobs, shutdown_ingest_jobs
 from .models import (
     HealthResponse,
+    IngestJobResponse,
     IngestResponse,
+    LivenessResponse,
+    MetricsResponse,
+    ReadinessResponse,
+    RollbackResponse,
     SearchRequest,
     SearchResponse,
 )
-from .retriever import get_collection_count, search
+from .retriever import get_collection_count, search_batch, search_response, warm_up
+from .watcher import shutdown_policy_watcher, start_policy_watcher
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,16 +71,60 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# ─── Lifespan: auto-ingest on startup ────────────────────────────────────────
+# ─── Lifespan: background ingest + warm-up on startup ───────────────────────
+
+# Startup progress, reported by GET /ready and GET /live.
+_ingested = False
+_warmed_up = False
+_startup_error: str | None = None
+
+
+def _startup() -> None:
+    """Load the model, ingest, and warm up — off the event loop."""
+    global _ingested, _warmed_up, _startup_error
+    started = time.perf_counter()
+    try:
+        logger.info("Loading policy index...")
+        stats = ensure_index()
+        logger.info(f"Index ready: {stats.documents} documents → {stats.chunks} chunks")
+        _ingested = True
+        start_policy_watcher()
+
+        elapsed = warm_up(WARMUP_QUERIES)
+        metrics.gauge("warmup_seconds").set(round(elapsed, 4))
+        logger.info(f"Warm-up: {len(WARMUP_QUERIES)} queries in {elapsed * 1000:.0f}ms")
+        _warmed_up = True
+    except Exception as e:
+        logger.exception("Startup failed")
+        _startup_error = str(e)
+        return
+    metrics.gauge("startup_seconds").set(round(time.perf_counter() - started, 4))
+    logger.info(f"RAG service ready in {time.perf_counter() - started:.1f}s")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Ingest policy documents when the service starts."""
-    logger.info("Starting RAG service — ingesting policy documents...")
-    docs_count, chunks_count = ingest_documents()
-    logger.info(f"Ingested {docs_count} documents → {chunks_count} chunks")
+    """Start serving at once; ingest and warm up in a background thread."""
+    logger.info("Starting RAG service")
+    get_search_executor()
+    threading.Thread(target=_startup, name="startup", daemon=True).start()
     yield
     logger.info("RAG service shutting down")
+    shutdown_policy_watcher()
+    shutdown_ingest_jobs()
+    shutdown_search_executor()
+    shutdown_query_batcher()
+    shutdown_embedding_pool()
+
+
+def _require_ready() -> None:
+    """Reject work that needs the model and index while startup is still running."""
+    if not _warmed_up:
+        raise HTTPException(
+            status_code=503,
+            detail="Service is starting up, please retry",
+            headers={"Retry-After": str(SEARCH_RETRY_AFTER)},
+        )
 
 
 app = FastAPI(
@@ -60,38 +143,146 @@ async def search_policies(request: SearchRequest) -> SearchResponse:
     Search policy documents using semantic similarity.
 
     This is the main endpoint called by the TypeScript MCP policy_search tool.
-    It embeds the query, searches ChromaDB, and returns ranked chunks.
+    It embeds the query, searches ChromaDB, and returns ranked chunks
+    (or a cached response if the same question was asked since the last ingest).
+    The work runs on the search executor so the event loop stays free;
+    when the executor is saturated the request is shed with 503.
     """
+    _require_ready()
     try:
-        results = search(query=request.query, top_k=request.top_k)
-        return SearchResponse(
-            query=request.query,
-            results=results,
-            total_chunks=get_collection_count(),
+        return await get_search_executor().run(
+            search_response, request.query, request.top_k, request.ef_search
+        )
+    except ExecutorOverloadedError:
+        logger.warning("Search executor saturated — shedding request")
+        metrics.counter("search_rejected").inc()
+        raise HTTPException(
+            status_code=503,
+            detail="Search service is at capacity, please retry",
+            headers={"Retry-After": str(SEARCH_RETRY_AFTER)},
         )
     except Exception as e:
         logger.error(f"Search failed: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
-@app.post("/ingest", response_model=IngestResponse)
-async def ingest_policies() -> IngestResponse:
+@app.post("/search/batch", response_model=list[SearchResponse])
+async def search_policies_batch(
+    requests: Annotated[
+        list[SearchRequest],
+        Body(min_length=1, max_length=SEARCH_BATCH_MAX_QUERIES),
+    ],
+) -> list[SearchResponse]:
     """
-    Re-ingest policy documents from disk.
+    Run several policy searches in one call, returning responses in order.
 
-    Clears existing chunks and re-processes all markdown files in the
-    policies directory. Use this after updating policy documents.
+    Lets the orchestrator fetch all the lookups for a conversation turn in a
+    single round trip: the queries share one model.encode call and one
+    multi-query ChromaDB search.
     """
+    _require_ready()
     try:
-        docs_count, chunks_count = ingest_documents()
-        return IngestResponse(
-            documents_processed=docs_count,
-            total_chunks=chunks_count,
-            message=f"Successfully ingested {docs_count} documents into {chunks_count} chunks",
+        return await get_search_executor().run(search_batch, requests)
+    except ExecutorOverloadedError:
+        logger.warning("Search executor saturated — shedding batch request")
+        metrics.counter("search_rejected").inc()
+        raise HTTPException(
+            status_code=503,
+            detail="Search service is at capacity, please retry",
+            headers={"Retry-After": str(SEARCH_RETRY_AFTER)},
         )
     except Exception as e:
-        logger.error(f"Ingestion failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
+        logger.error(f"Batch search failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch search failed: {str(e)}")
+
+
+def _ingest_response(stats: IngestStats) -> IngestResponse:
+    return IngestResponse(
+        documents_processed=stats.documents,
+        total_chunks=stats.chunks,
+        added=stats.added,
+        updated=stats.updated,
+        removed=stats.removed,
+        unchanged=stats.unchanged,
+        message=(
+            f"Successfully ingested {stats.documents} documents into {stats.chunks} chunks "
+            f"({stats.added} added, {stats.updated} updated, {stats.removed} removed, "
+            f"{stats.unchanged} unchanged)"
+        ),
+    )
+
+
+def _job_response(job: IngestJob) -> IngestJobResponse:
+    progress = job.progress
+    elapsed = None
+    if job.started_at is not None:
+        elapsed = round((job.finished_at or time.time()) - job.started_at, 3)
+    rate = progress.chunks_per_second
+    eta = progress.eta_seconds
+    return IngestJobResponse(
+        job_id=job.id,
+        status=job.status,
+        phase=progress.phase,
+        full=job.full,
+        files=sorted(job.files) if job.files is not None else None,
+        chunks_total=progress.chunks_total,
+        chunks_embedded=progress.chunks_embedded,
+        chunks_per_second=round(rate, 1) if rate is not None else None,
+        eta_seconds=round(eta, 1) if eta is not None else None,
+        elapsed_seconds=elapsed,
+        coalesced_requests=job.coalesced,
+        result=_ingest_response(job.stats) if job.stats is not None else None,
+        error=job.error,
+    )
+
+
+@app.post("/ingest", response_model=IngestJobResponse, status_code=202)
+async def ingest_policies(response: Response, full: bool = False) -> IngestJobResponse:
+    """
+    Re-ingest policy documents from disk, in the background.
+
+    Incremental by default: only chunks that are new or whose content changed
+    are re-embedded, and chunks that no longer exist are removed. Use this
+    after updating policy documents. ?full=true clears the collection and
+    re-processes every markdown file in the policies directory.
+
+    Returns 202 with a job id at once; poll GET /ingest/{job_id}. Only one
+    ingest runs at a time — a request made while another is waiting to
+    start joins that job and gets its id.
+    """
+    _require_ready()
+    job = get_ingest_jobs().submit(full=full)
+    response.headers["Location"] = f"/ingest/{job.id}"
+    return _job_response(job)
+
+
+@app.get("/ingest/{job_id}", response_model=IngestJobResponse)
+async def ingest_job_status(job_id: str) -> IngestJobResponse:
+    """Phase, progress, throughput and ETA of an ingest job."""
+    job = get_ingest_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown ingest job: {job_id}")
+    return _job_response(job)
+
+
+@app.post("/index/rollback", response_model=RollbackResponse)
+async def rollback_policies_index() -> RollbackResponse:
+    """
+    Swap the index version replaced by the last full re-ingest back in.
+
+    Available for INDEX_ROLLBACK_GRACE_SECONDS after that re-ingest (409
+    otherwise). Calling it again rolls forward.
+    """
+    _require_ready()
+    try:
+        snapshot = rollback_index()
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return RollbackResponse(
+        collection=snapshot.store.name,
+        total_chunks=snapshot.chunk_count,
+        message=f"Rolled back to {snapshot.store.name} ({snapshot.chunk_count} chunks)",
+    )
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -105,6 +296,40 @@ async def health_check() -> HealthResponse:
     )
 
 
+@app.get("/live", response_model=LivenessResponse)
+async def liveness_check(response: Response) -> LivenessResponse:
+    """
+    Liveness probe: cheap, touches no model or index.
+
+    Up as soon as the process serves HTTP; only fails (503) if the startup
+    ingest crashed, since the instance can't recover without a restart.
+    """
+    if _startup_error is not None:
+        response.status_code = 503
+        return LivenessResponse(status="failed", detail=_startup_error)
+    return LivenessResponse(status="alive")
+
+
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """
+    Readiness probe for the load balancer.
+
+    503 until the startup ingest and warm-up have both finished, so traffic
+    is never routed to an instance with a cold model or an empty index.
+    """
+    ready = _ingested and _warmed_up
+    if not ready:
+        response.status_code = 503
+    return ReadinessResponse(ready=ready, ingested=_ingested, warmed_up=_warmed_up)
+
+
+@app.get("/metrics", response_model=MetricsResponse)
+async def get_metrics() -> MetricsResponse:
+    """In-process metrics snapshot."""
+    return MetricsResponse(metrics=metrics.snapshot())
+
+
 # ─── Direct execution ────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+In-process metrics: counters, gauges and summaries, exposed via GET /metrics.
+
+Deliberately tiny — a flat name → value snapshot is all the support
+dashboards need, and it avoids pulling in a Prometheus client.
+"""
+
+import threading
+
+_lock = threading.Lock()
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with _lock:
+            self.value += amount
+
+
+class Gauge:
+    """Last-set value (e.g. a size or ratio that can go up and down)."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        with _lock:
+            self.value = value
+
+
+class Summary:
+    """Running count / sum / max of observed values."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        with _lock:
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+
+# ─── Registry ─────────────────────────────────────────────────────────────────
+
+_counters: dict[str, Counter] = {}
+_gauges: dict[str, Gauge] = {}
+_summaries: dict[str, Summary] = {}
+
+
+def counter(name: str) -> Counter:
+    """Get or create the counter registered under name."""
+    with _lock:
+        return _counters.setdefault(name, Counter())
+
+
+def gauge(name: str) -> Gauge:
+    """Get or create the gauge registered under name."""
+    with _lock:
+        return _gauges.setdefault(name, Gauge())
+
+
+def summary(name: str) -> Summary:
+    """Get or create the summary registered under name."""
+    with _lock:
+        return _summaries.setdefault(name, Summary())
+
+
+def snapshot() -> dict[str, float]:
+    """Flatten all metrics into a name → value mapping."""
+    with _lock:
+        data: dict[str, float] = {name: c.value for name, c in _counters.items()}
+        data.update({name: g.value for name, g in _gauges.items()})
+        for name, s in _summaries.items():
+            data[f"{name}_count"] = s.count
+            data[f"{name}_sum"] = round(s.total, 4)
+            data[f"{name}_avg"] = round(s.total / s.count, 4) if s.count else 0.0
+            data[f"{name}_max"] = round(s.max, 4)
+    return data
@@ -12,6 +12,13 @@ class SearchRequest(BaseModel):
     """Incoming search query from the MCP policy_search tool."""
     query: str = Field(..., description="Natural language question about policies", min_length=1)
     top_k: int = Field(default=3, description="Number of chunks to return", ge=1, le=10)
+    ef_search: int | None = Field(
+        default=None,
+        description="HNSW candidate pool for this query — higher trades latency for recall "
+                    "(defaults to the index's HNSW_SEARCH_EF; ignored by exact backends)",
+        ge=1,
+        le=1000,
+    )
 
 
 class ChunkResult(BaseModel):
@@ -34,6 +41,36 @@ class IngestResponse(BaseModel):
     """Response after ingesting/re-ingesting policy documents."""
     documents_processed: int
     total_chunks: int
+    added: int = Field(default=0, description="Chunks embedded for the first time")
+    updated: int = Field(default=0, description="Chunks re-embedded because their content changed")
+    removed: int = Field(default=0, description="Chunks deleted (document or chunk no longer exists)")
+    unchanged: int = Field(default=0, description="Chunks kept as-is without re-embedding")
+    message: str
+
+
+class IngestJobResponse(BaseModel):
+    """Status of a background ingest job (returned by POST /ingest and GET /ingest/{job_id})."""
+    job_id: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    phase: str = Field(..., description="queued, loading, chunking/diffing, embedding, storing, done or failed")
+    full: bool = Field(..., description="Full rebuild rather than incremental")
+    files: list[str] | None = Field(
+        default=None, description="Policy files this job re-indexes (policy watcher); null = the whole directory"
+    )
+    chunks_total: int = Field(..., description="Chunks this job has to embed (known once embedding starts)")
+    chunks_embedded: int
+    chunks_per_second: float | None = None
+    eta_seconds: float | None = Field(default=None, description="Estimated time left in the embedding phase")
+    elapsed_seconds: float | None = None
+    coalesced_requests: int = Field(default=0, description="Later requests folded into this job")
+    result: IngestResponse | None = None
+    error: str | None = None
+
+
+class RollbackResponse(BaseModel):
+    """Response after swapping the previous index version back in."""
+    collection: str = Field(..., description="Collection now serving searches")
+    total_chunks: int
     message: str
 
 
@@ -45,3 +82,23 @@ class HealthResponse(BaseModel):
     collection_name: str
     total_chunks: int
     embedding_model: str
+
+
+class LivenessResponse(BaseModel):
+    """Liveness probe — is the process up (and did startup not crash)?"""
+    status: str
+    detail: str | None = None
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness probe — ready only once startup ingest and warm-up are done."""
+    ready: bool
+    ingested: bool
+    warmed_up: bool
+
+
+# ─── Metrics ──────────────────────────────────────────────────────────────────
+
+class MetricsResponse(BaseModel):
+    """Flat snapshot of in-process counters and summaries."""
+    metrics: dict[str, float]
@@ -0,0 +1,78 @@
+"""
+PCA projection of embeddings, fitted at ingest time.
+
+all-MiniLM-L6-v2 produces 384-dim vectors, but a policy corpus occupies a
+much smaller subspace. Projecting stored and query embeddings onto the top
+PCA_DIM principal components of the chunk embeddings shrinks the index and
+every scan proportionally, while keeping most of the variance — the share
+retained is logged and published on GET /metrics.
+
+The projection must be the same for the index and its queries, so it is
+persisted next to the index whenever the index itself is persistent.
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class PCAProjection:
+    """Centering + linear projection onto the top principal components."""
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, variance_retained: float) -> None:
+        self.mean = mean.astype(np.float32)
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.variance_retained = variance_retained
+
+    @property
+    def input_dim(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def output_dim(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, embeddings: np.ndarray, dim: int) -> "PCAProjection":
+        """
+        Fit on the chunk embeddings via SVD of the centered matrix.
+
+        A corpus can't support more components than it has chunks, so dim is
+        capped at min(dim, n_chunks, input_dim).
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        n, d = matrix.shape
+        k = min(dim, n, d)
+        if k < dim:
+            logger.warning(f"PCA_DIM={dim} capped to {k} (corpus has {n} chunks of dim {d})")
+
+        mean = matrix.mean(axis=0)
+        _, singular_values, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+        variance = singular_values ** 2
+        total = float(variance.sum())
+        retained = float(variance[:k].sum() / total) if total > 0 else 1.0
+        return cls(mean, vt[:k], retained)
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """Project (n, input_dim) embeddings to (n, output_dim)."""
+        return (np.asarray(embeddings, dtype=np.float32) - self.mean) @ self.components.T
+
+    # ─── Persistence ─────────────────────────────────────────────────────────
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                mean=self.mean,
+                components=self.components,
+                variance_retained=np.float32(self.variance_retained),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "PCAProjection":
+        with np.load(path) as data:
+            return cls(data["mean"], data["components"], float(data["variance_retained"]))
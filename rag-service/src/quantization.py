@@ -0,0 +1,181 @@
+"""
+Compressed candidate indexes for NumpyVectorStore.
+
+For large corpora the float32 matrix (384 × 4 bytes per chunk) dominates
+memory. A quantized index keeps a compact code per chunk for the full scan,
+picks the best few hundred candidates from it, and NumpyVectorStore rescores
+only those against the full-precision vectors (which can then live in a
+memory-mapped file rather than RAM).
+
+  int8   — per-dimension affine scalar quantization (scale/offset fitted over
+           the indexed vectors): 1 byte per dimension, ~4x smaller than float32.
+  binary — one sign bit per dimension, packed: 48 bytes per 384-dim vector,
+           ~32x smaller. Candidates are ranked by Hamming distance (XOR +
+           popcount); coarser than int8, so it leans harder on rescoring.
+"""
+
+import copy
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Rows scanned per block. Bounds the float32 temporaries a scan allocates and
+# keeps each block's decoded codes (~24MB at 384 dims) close to cache size —
+# much larger blocks were measurably slower.
+SCAN_BLOCK_ROWS = 16384
+
+
+class QuantizedIndex(ABC):
+    """Compact per-chunk codes that yield approximate top candidates."""
+
+    kind: str
+    codes: np.ndarray
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        """Memory held by the codes and any fitted parameters."""
+
+    @abstractmethod
+    def _encode(self, matrix: np.ndarray) -> np.ndarray:
+        """Codes for matrix's rows, using the parameters already fitted."""
+
+    def updated(self, keep: np.ndarray, matrix: np.ndarray) -> "QuantizedIndex":
+        """
+        A new index over this one's rows at keep followed by matrix's rows.
+
+        Kept codes are copied, only the new rows are encoded, and nothing is
+        refitted — int8 values outside the fitted range clip, which only
+        coarsens candidate selection (rescoring is exact) until the next
+        full build.
+        """
+        index = copy.copy(self)
+        index.codes = np.concatenate([self.codes[keep], self._encode(matrix)])
+        return index
+
+    @abstractmethod
+    def _block_scores(self, queries: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """Approximate similarities (higher = better) of queries vs rows [start, stop)."""
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def candidates(self, queries: np.ndarray, k: int) -> np.ndarray:
+        """
+        Row indices of the k best approximate matches per query, shape (m, k).
+
+        Scans in blocks, keeping each block's top k, so peak temporary memory
+        is bounded by SCAN_BLOCK_ROWS regardless of corpus size.
+        """
+        total = len(self)
+        k = min(k, total)
+        best_idx: list[np.ndarray] = []
+        best_scores: list[np.ndarray] = []
+        for start in range(0, total, SCAN_BLOCK_ROWS):
+            stop = min(start + SCAN_BLOCK_ROWS, total)
+            scores = self._block_scores(queries, start, stop)
+            if stop - start > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+            else:
+                top = np.broadcast_to(np.arange(stop - start), scores.shape)
+            best_idx.append(top + start)
+            best_scores.append(scores)
+
+        idx = np.concatenate(best_idx, axis=1)
+        scores = np.concatenate(best_scores, axis=1)
+        if idx.shape[1] > k:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            idx = np.take_along_axis(idx, top, axis=1)
+        return idx
+
+
+class Int8Index(QuantizedIndex):
+    """
+    Per-dimension affine int8 codes: x ≈ offset + scale * code, code ∈ [0, 255].
+
+    A query's approximate dot product with a row is then
+    q·offset + (q * scale)·code — one small matmul over the uint8 codes.
+    """
+
+    kind = "int8"
+
+    def __init__(self, matrix: np.ndarray) -> None:
+        self.offset = matrix.min(axis=0).astype(np.float32)
+        scale = (matrix.max(axis=0) - self.offset) / 255.0
+        scale[scale == 0] = 1.0
+        self.scale = scale.astype(np.float32)
+        self.codes = self._encode(matrix)
+
+    def _encode(self, matrix: np.ndarray) -> np.ndarray:
+        codes = np.rint((matrix - self.offset) / self.scale)
+        return np.ascontiguousarray(np.clip(codes, 0, 255).astype(np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.offset.nbytes + self.scale.nbytes
+
+    def _block_scores(self, queries: np.ndarray, start: int, stop: int) -> np.ndarray:
+        block = self.codes[start:stop].astype(np.float32)
+        return (queries * self.scale) @ block.T + (queries @ self.offset)[:, np.newaxis]
+
+
+def _popcount_table() -> np.ndarray:
+    return np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class BinaryIndex(QuantizedIndex):
+    """
+    Sign-bit codes packed into uint64 words; similarity = -Hamming distance.
+
+    For normalized vectors the fraction of differing sign bits tracks the
+    angle between them, so Hamming order is a cheap proxy for cosine order.
+    """
+
+    kind = "binary"
+
+    def __init__(self, matrix: np.ndarray) -> None:
+        self.codes = self._pack(matrix)
+
+    def _encode(self, matrix: np.ndarray) -> np.ndarray:
+        return self._pack(matrix)
+
+    @staticmethod
+    def _pack(matrix: np.ndarray) -> np.ndarray:
+        bits = np.packbits(matrix > 0, axis=1)
+        pad = -bits.shape[1] % 8  # whole uint64 words per row
+        if pad:
+            bits = np.pad(bits, ((0, 0), (0, pad)))
+        return np.ascontiguousarray(bits).view(np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+    def _block_scores(self, queries: np.ndarray, start: int, stop: int) -> np.ndarray:
+        diff = self._pack(queries)[:, np.newaxis, :] ^ self.codes[np.newaxis, start:stop, :]
+        if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+            distances = np.bitwise_count(diff).sum(axis=2, dtype=np.int32)
+        else:
+            distances = _POPCOUNT[diff.view(np.uint8)].sum(axis=2, dtype=np.int32)
+        return -distances
+
+
+_POPCOUNT = _popcount_table()
+
+
+def build_quantized_index(kind: str, matrix: np.ndarray) -> QuantizedIndex | None:
+    """Build the index named by VECTOR_QUANTIZATION ("none" → no index)."""
+    if kind == "none" or len(matrix) == 0:
+        return None
+    if kind == "int8":
+        return Int8Index(matrix)
+    if kind == "binary":
+        return BinaryIndex(matrix)
+    raise ValueError(f"Unknown VECTOR_QUANTIZATION: {kind!r}")
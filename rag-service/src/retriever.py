@@ -1,5 +1,5 @@
 """
-Retriever: embed a query → cosine similarity search in ChromaDB → return ranked chunks.
+Retriever: embed a query → cosine similarity search in the vector store → return ranked chunks.
 
 This is the "R" in RAG — retrieval. The results are passed back to the
 TypeScript agent, which feeds them to the LLM as context for answering
@@ -7,50 +7,118 @@ the customer's policy question.
 """
 
 import logging
+import threading
+import time
 
-from .config import DEFAULT_TOP_K
-from .ingest import get_collection, get_embedding_model
-from .models import ChunkResult
+import numpy as np
+
+from .batcher import encode_query
+from .cache import LRUCache, SingleFlight, normalize_query
+from .config import (
+    DEFAULT_TOP_K,
+    EMBEDDING_MODEL,
+    QUERY_ENCODER,
+    QUERY_EMBEDDING_CACHE_MAX_BYTES,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    SEARCH_RESULT_CACHE_MAX_BYTES,
+    SEARCH_RESULT_CACHE_SIZE,
+    SEARCH_RESULT_CACHE_TTL_SECONDS,
+)
+from .ingest import IndexSnapshot, get_index_snapshot, get_query_encoder
+from .models import ChunkResult, SearchRequest, SearchResponse
+from .vector_store import QueryResult
 
 logger = logging.getLogger(__name__)
 
+# Query embeddings keyed by (model, query encoder, normalized query) —
+# repeated questions skip the encoder entirely.
+_embedding_cache: LRUCache[np.ndarray] = LRUCache(
+    "query_embedding_cache",
+    max_entries=QUERY_EMBEDDING_CACHE_SIZE,
+    max_bytes=QUERY_EMBEDDING_CACHE_MAX_BYTES,
+    ttl_seconds=QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    sizeof=lambda embedding: embedding.nbytes,
+)
+
+# Full responses keyed by (normalized query, top_k, ef_search, collection version).
+_result_cache: LRUCache[SearchResponse] = LRUCache(
+    "search_result_cache",
+    max_entries=SEARCH_RESULT_CACHE_SIZE,
+    max_bytes=SEARCH_RESULT_CACHE_MAX_BYTES,
+    ttl_seconds=SEARCH_RESULT_CACHE_TTL_SECONDS,
+    sizeof=lambda response: sum(len(r.text) + len(r.source) + 64 for r in response.results) + 128,
+)
+_result_cache_version = 0
+_result_cache_lock = threading.Lock()
+
+# Identical searches in flight at the same time share one encode + query.
+_search_flight: SingleFlight[list[ChunkResult]] = SingleFlight("search")
+
+
+def _embedding_key(query: str) -> tuple[str, str, str]:
+    return (EMBEDDING_MODEL, QUERY_ENCODER, normalize_query(query))
 
-def search(query: str, top_k: int = DEFAULT_TOP_K) -> list[ChunkResult]:
+
+def _cache_embedding(key: tuple[str, str, str], embedding: np.ndarray) -> np.ndarray:
     """
-    Embed the query and retrieve the top-k most similar chunks.
+    Cache a copy of embedding: encoders return rows of the whole batch array,
+    and a cached view would keep that entire batch alive while the byte
+    budget only counts one row.
+    """
+    embedding = np.array(embedding, copy=True)
+    _embedding_cache.put(key, embedding)
+    return embedding
 
-    ChromaDB returns distances (lower = more similar for cosine).
-    We convert to similarity scores (higher = better) for the API.
+
+def embed_query(query: str) -> np.ndarray:
+    """Embed a query, serving repeats from the in-process embedding cache."""
+    key = _embedding_key(query)
+    embedding = _embedding_cache.get(key)
+    if embedding is None:
+        embedding = _cache_embedding(key, encode_query(query))
+    return embedding
+
+
+def embed_queries(queries: list[str]) -> list[np.ndarray]:
     """
-    model = get_embedding_model()
-    collection = get_collection()
+    Embed several queries with at most one model.encode call.
 
-    if collection.count() == 0:
-        logger.warning("Collection is empty — have you run ingest?")
-        return []
+    Cached and duplicate queries are resolved first; only the remaining
+    distinct queries go to the model, as a single batch.
+    """
+    keys = [_embedding_key(q) for q in queries]
+    found: dict[tuple[str, str, str], np.ndarray] = {}
+    missing: dict[tuple[str, str, str], str] = {}
+    for key, query in zip(keys, queries):
+        if key in found or key in missing:
+            continue
+        embedding = _embedding_cache.get(key)
+        if embedding is None:
+            missing[key] = query
+        else:
+            found[key] = embedding
 
-    # Embed the query
-    query_embedding = model.encode([query], show_progress_bar=False).tolist()
+    if missing:
+        encoded = get_query_encoder().encode(list(missing.values()), show_progress_bar=False)
+        for key, embedding in zip(missing, encoded):
+            found[key] = _cache_embedding(key, embedding)
 
-    # Query ChromaDB
-    results = collection.query(
-        query_embeddings=query_embedding,
-        n_results=min(top_k, collection.count()),
-        include=["documents", "metadatas", "distances"],
-    )
+    return [found[key] for key in keys]
 
-    # Build response — convert distance to similarity score
-    chunks: list[ChunkResult] = []
 
-    if not results["documents"] or not results["documents"][0]:
-        return chunks
+def _project(embeddings: np.ndarray, snapshot: IndexSnapshot) -> np.ndarray:
+    """Apply the index's PCA projection (if any) to raw query embeddings."""
+    if snapshot.projection is None:
+        return embeddings
+    return snapshot.projection.transform(embeddings)
 
-    for doc, metadata, distance in zip(
-        results["documents"][0],
-        results["metadatas"][0],
-        results["distances"][0],
-    ):
-        # ChromaDB cosine distance is in [0, 2]; similarity = 1 - (distance / 2)
+
+def _to_chunks(result: QueryResult, top_k: int) -> list[ChunkResult]:
+    """Convert one query's store matches into at most top_k scored ChunkResults."""
+    chunks: list[ChunkResult] = []
+    for doc, metadata, distance in zip(result.documents[:top_k], result.metadatas[:top_k], result.distances[:top_k]):
+        # Cosine distance is in [0, 2]; similarity = 1 - (distance / 2)
         similarity = round(1.0 - (distance / 2.0), 4)
 
         chunks.append(ChunkResult(
@@ -58,11 +126,176 @@ def search(query: str, top_k: int = DEFAULT_TOP_K) -> list[ChunkResult]:
             source=metadata.get("source", "unknown"),
             score=similarity,
         ))
+    return chunks
+
+
+def search(
+    query: str,
+    top_k: int = DEFAULT_TOP_K,
+    snapshot: IndexSnapshot | None = None,
+    ef_search: int | None = None,
+) -> list[ChunkResult]:
+    """
+    Embed the query and retrieve the top-k most similar chunks.
+
+    The store returns cosine distances (lower = more similar).
+    We convert to similarity scores (higher = better) for the API.
+    The store handle and chunk count come from the index snapshot,
+    so the only vector store call is the query itself.
+
+    ef_search optionally widens the approximate search's candidate pool for
+    this request (higher = better recall, slower); exact stores ignore it.
+
+    Concurrent calls with the same (normalized query, top_k, ef_search,
+    index version) are coalesced: one caller does the work, the rest share
+    its result.
+    """
+    if snapshot is None:
+        snapshot = get_index_snapshot()
+
+    if snapshot.store is None or snapshot.chunk_count == 0:
+        logger.warning("Collection is empty — have you run ingest?")
+        return []
+
+    key = _result_key(query, top_k, ef_search, snapshot.version)
+    return _search_flight.do(key, lambda: _query_index(query, top_k, ef_search, snapshot))
+
+
+def _query_index(query: str, top_k: int, ef_search: int | None, snapshot: IndexSnapshot) -> list[ChunkResult]:
+    """Encode the query and run the vector search against the snapshot."""
+    # Embed the query (cached, else coalesced with concurrent searches)
+    query_embedding = _project(embed_query(query)[np.newaxis, :], snapshot)
+
+    # Query the vector store
+    result = snapshot.store.query(
+        query_embedding,
+        n_results=min(top_k, snapshot.chunk_count),
+        ef_search=min(ef_search, snapshot.chunk_count) if ef_search else None,
+    )[0]
+
+    # Build response — convert distance to similarity score
+    chunks = _to_chunks(result, top_k)
 
     logger.info(f"Query: '{query[:60]}...' → {len(chunks)} results (top score: {chunks[0].score if chunks else 'N/A'})")
     return chunks
 
 
 def get_collection_count() -> int:
-    """Return the number of chunks in the collection."""
-    return get_collection().count()
+    """Return the number of chunks in the collection (from the index snapshot)."""
+    return get_index_snapshot().chunk_count
+
+
+def _result_cache_snapshot() -> IndexSnapshot:
+    """
+    Read the index snapshot, dropping the result cache if its version moved.
+
+    Entries are keyed on the version, so stale ones could never be served
+    anyway — clearing just stops them lingering in memory after an ingest.
+    """
+    global _result_cache_version
+    snapshot = get_index_snapshot()
+    if snapshot.version != _result_cache_version:
+        with _result_cache_lock:
+            if snapshot.version != _result_cache_version:
+                _result_cache.clear()
+                _result_cache_version = snapshot.version
+    return snapshot
+
+
+def _result_key(query: str, top_k: int, ef_search: int | None, version: int) -> tuple:
+    return (normalize_query(query), top_k, ef_search, version)
+
+
+def search_response(
+    query: str,
+    top_k: int = DEFAULT_TOP_K,
+    ef_search: int | None = None,
+) -> SearchResponse:
+    """
+    Full search → SearchResponse, served from the result cache when possible.
+
+    One snapshot is read up front so the version, results and total_chunks
+    all describe the same index.
+    """
+    snapshot = _result_cache_snapshot()
+    key = _result_key(query, top_k, ef_search, snapshot.version)
+    cached = _result_cache.get(key)
+    if cached is not None:
+        return cached.model_copy(update={"query": query})
+
+    response = SearchResponse(
+        query=query,
+        results=search(query=query, top_k=top_k, snapshot=snapshot, ef_search=ef_search),
+        total_chunks=snapshot.chunk_count,
+    )
+    _result_cache.put(key, response)
+    return response
+
+
+def search_batch(requests: list[SearchRequest]) -> list[SearchResponse]:
+    """
+    Answer several searches at once, preserving order.
+
+    Cache hits are served directly; the misses share one model.encode call
+    and one multi-query store.query sized for the largest top_k (and
+    ef_search), whose per-query result lists are then truncated to each
+    request's top_k.
+    """
+    snapshot = _result_cache_snapshot()
+    keys = [_result_key(r.query, r.top_k, r.ef_search, snapshot.version) for r in requests]
+    responses: list[SearchResponse | None] = []
+    misses: list[int] = []
+    for i, (request, key) in enumerate(zip(requests, keys)):
+        cached = _result_cache.get(key)
+        responses.append(cached.model_copy(update={"query": request.query}) if cached is not None else None)
+        if cached is None:
+            misses.append(i)
+
+    if not misses:
+        return responses
+
+    miss_results: list[list[ChunkResult]] = [[] for _ in misses]
+    if snapshot.store is not None and snapshot.chunk_count > 0:
+        embeddings = embed_queries([requests[i].query for i in misses])
+        n_results = min(max(requests[i].top_k for i in misses), snapshot.chunk_count)
+        ef_search = max((requests[i].ef_search or 0) for i in misses)
+        results = snapshot.store.query(
+            _project(np.stack(embeddings), snapshot),
+            n_results=n_results,
+            ef_search=min(ef_search, snapshot.chunk_count) if ef_search else None,
+        )
+        for j, i in enumerate(misses):
+            miss_results[j] = _to_chunks(results[j], top_k=requests[i].top_k)
+    else:
+        logger.warning("Collection is empty — have you run ingest?")
+
+    for j, i in enumerate(misses):
+        response = SearchResponse(query=requests[i].query, results=miss_results[j], total_chunks=snapshot.chunk_count)
+        _result_cache.put(keys[i], response)
+        responses[i] = response
+
+    logger.info(f"Batch search: {len(requests)} queries, {len(misses)} computed")
+    return responses
+
+
+# ─── Warm-up ──────────────────────────────────────────────────────────────────
+
+
+def warm_up(queries: list[str]) -> float:
+    """
+    Run queries through the real search path without touching the caches.
+
+    Each query goes through the micro-batcher alone (starting its thread),
+    then all of them as one batch — so both single and batched encode shapes
+    and store.query are exercised. Returns the elapsed seconds.
+    """
+    started = time.perf_counter()
+    snapshot = get_index_snapshot()
+    if queries and snapshot.store is not None and snapshot.chunk_count > 0:
+        n_results = min(DEFAULT_TOP_K, snapshot.chunk_count)
+        for query in queries:
+            embedding = _project(encode_query(query)[np.newaxis, :], snapshot)
+            snapshot.store.query(embedding, n_results=n_results)
+        embeddings = get_query_encoder().encode(queries, show_progress_bar=False)
+        snapshot.store.query(_project(embeddings, snapshot), n_results=n_results)
+    return time.perf_counter() - started
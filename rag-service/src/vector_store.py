@@ -0,0 +1,575 @@
+"""
+Vector stores: the one place that talks to a vector database.
+
+ingest.py and retriever.py only see the VectorStore interface
+(add / upsert / delete / query / count / snapshot), so the engine behind it is
+a config choice (VECTOR_BACKEND) rather than a code change:
+
+  chroma — ChromaStore wraps a ChromaDB collection (HNSW, optional persistence).
+           Full rebuilds go into a new versioned collection behind an alias
+           (blue/green), so the live one is never emptied mid-ingest.
+  numpy  — NumpyVectorStore keeps every chunk embedding in one contiguous,
+           L2-normalized float32 matrix and answers a query with a single
+           matrix-vector product plus argpartition. Exact search with no HNSW
+           graph, SQLite metadata or per-row Python conversions — for a corpus
+           of a few hundred policy chunks, faster and simpler than ChromaDB.
+           VECTOR_QUANTIZATION swaps the scan for a compressed index with
+           full-precision rescoring (see quantization.py) for large corpora.
+
+Every store reports cosine distances (1 - similarity, as ChromaDB does), so the
+retriever scores all backends identically.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .config import (
+    CHROMA_COLLECTION,
+    CHROMA_PERSIST_DIR,
+    HNSW_CONSTRUCTION_EF,
+    HNSW_M,
+    HNSW_SEARCH_EF,
+    QUANTIZED_RESCORE_CANDIDATES,
+    QUANTIZED_RESCORE_DIR,
+    VECTOR_BACKEND,
+    VECTOR_QUANTIZATION,
+)
+from .quantization import SCAN_BLOCK_ROWS, QuantizedIndex, build_quantized_index
+
+if TYPE_CHECKING:  # chromadb takes ~0.5s to import — only load it if the chroma backend is used
+    import chromadb
+
+logger = logging.getLogger(__name__)
+
+Embeddings = np.ndarray | list[list[float]]
+
+
+@dataclass
+class QueryResult:
+    """Ranked matches for one query vector, best first."""
+    ids: list[str] = field(default_factory=list)
+    documents: list[str] = field(default_factory=list)
+    metadatas: list[dict] = field(default_factory=list)
+    distances: list[float] = field(default_factory=list)
+
+
+class VectorStore(ABC):
+    """Minimal vector index interface used by ingest and retrieval."""
+
+    backend: str
+    name: str
+
+    @abstractmethod
+    def add(self, ids: list[str], documents: list[str], embeddings: Embeddings, metadatas: list[dict]) -> None:
+        """Insert new chunks (ids must not already exist)."""
+
+    @abstractmethod
+    def upsert(self, ids: list[str], documents: list[str], embeddings: Embeddings, metadatas: list[dict]) -> None:
+        """Insert chunks, replacing any with the same id."""
+
+    @abstractmethod
+    def update_metadata(self, ids: list[str], metadatas: list[dict]) -> None:
+        """Replace the metadata of existing chunks, keeping their documents and vectors."""
+
+    @abstractmethod
+    def delete(self, ids: list[str]) -> None:
+        """Remove chunks by id (unknown ids are ignored)."""
+
+    @abstractmethod
+    def query(
+        self,
+        query_embeddings: Embeddings,
+        n_results: int,
+        ef_search: int | None = None,
+    ) -> list[QueryResult]:
+        """
+        Top-n matches for each query vector, best first.
+
+        ef_search widens the candidate pool of approximate indexes for this
+        call (must not exceed count()); exact stores ignore it.
+        """
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored chunks."""
+
+    @abstractmethod
+    def snapshot(self) -> dict[str, dict]:
+        """Metadata of every stored chunk, keyed by id."""
+
+    @abstractmethod
+    def get_fingerprint(self) -> str | None:
+        """Fingerprint of the corpus the stored chunks were built from, if recorded."""
+
+    @abstractmethod
+    def set_fingerprint(self, fingerprint: str) -> None:
+        """Record the corpus fingerprint (only once the index is fully built)."""
+
+    @abstractmethod
+    def get_settings(self) -> dict | None:
+        """Settings the stored vectors were built with (model, PCA_DIM, chunking, HNSW), if recorded."""
+
+    @abstractmethod
+    def set_settings(self, settings: dict) -> None:
+        """Record the build settings (a full rebuild writes them before the fingerprint)."""
+
+    @abstractmethod
+    def drop(self) -> None:
+        """Delete the stored index for good (once nothing can query it any more)."""
+
+
+# ─── ChromaDB ─────────────────────────────────────────────────────────────────
+
+# Collection metadata keys holding the corpus fingerprint and the build
+# settings (JSON — metadata values must be scalars).
+FINGERPRINT_KEY = "corpus_fingerprint"
+SETTINGS_KEY = "index_settings"
+
+_chroma_client: "chromadb.ClientAPI | None" = None
+
+
+def get_chroma_client() -> "chromadb.ClientAPI":
+    """Get or create the ChromaDB client (in-memory or persistent)."""
+    global _chroma_client
+    if _chroma_client is None:
+        import chromadb
+
+        if CHROMA_PERSIST_DIR:
+            _chroma_client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+            logger.info(f"ChromaDB persistent client at {CHROMA_PERSIST_DIR}")
+        else:
+            _chroma_client = chromadb.Client()
+            logger.info("ChromaDB in-memory client")
+    return _chroma_client
+
+
+class ChromaStore(VectorStore):
+    """VectorStore backed by a ChromaDB collection with cosine HNSW."""
+
+    backend = "chroma"
+
+    def __init__(self, name: str = CHROMA_COLLECTION) -> None:
+        self.name = name
+        self.collection = get_chroma_client().get_or_create_collection(
+            name=name,
+            metadata={
+                "hnsw:space": "cosine",
+                "hnsw:M": HNSW_M,
+                "hnsw:construction_ef": HNSW_CONSTRUCTION_EF,
+                "hnsw:search_ef": HNSW_SEARCH_EF,
+            },
+        )
+        self._apply_search_ef()
+
+    def _apply_search_ef(self) -> None:
+        """
+        Bring a reused collection's search_ef in line with HNSW_SEARCH_EF.
+
+        Creation metadata only applies to new collections. M and
+        construction_ef shape the built graph, so a change of those rebuilds
+        the index (they are in ingest's index settings); search_ef is a query
+        knob and can be changed in place on Chroma ≥ 1.0.
+        """
+        configuration = getattr(self.collection, "configuration", None) or {}
+        current = (configuration.get("hnsw") or {}).get("ef_search", HNSW_SEARCH_EF)
+        if current == HNSW_SEARCH_EF:
+            return
+        try:
+            self.collection.modify(configuration={"hnsw": {"ef_search": HNSW_SEARCH_EF}})
+            logger.info(f"Collection {self.name}: search_ef {current} → {HNSW_SEARCH_EF}")
+        except Exception as e:
+            logger.warning(f"Collection {self.name} keeps search_ef {current}, not HNSW_SEARCH_EF={HNSW_SEARCH_EF}: {e}")
+
+    def add(self, ids: list[str], documents: list[str], embeddings: Embeddings, metadatas: list[dict]) -> None:
+        self.collection.add(ids=ids, documents=documents, embeddings=_as_lists(embeddings), metadatas=metadatas)
+
+    def upsert(self, ids: list[str], documents: list[str], embeddings: Embeddings, metadatas: list[dict]) -> None:
+        self.collection.upsert(ids=ids, documents=documents, embeddings=_as_lists(embeddings), metadatas=metadatas)
+
+    def update_metadata(self, ids: list[str], metadatas: list[dict]) -> None:
+        if ids:
+            self.collection.update(ids=ids, metadatas=metadatas)
+
+    def delete(self, ids: list[str]) -> None:
+        if ids:
+            self.collection.delete(ids=ids)
+
+    def query(
+        self,
+        query_embeddings: Embeddings,
+        n_results: int,
+        ef_search: int | None = None,
+    ) -> list[QueryResult]:
+        # ChromaDB fixes search_ef per collection, but HNSW searches with
+        # max(ef, k) — so asking for ef_search results and keeping the best
+        # n_results gives this query a wider candidate pool.
+        fetch = max(n_results, ef_search or 0)
+        results = self.collection.query(
+            query_embeddings=_as_lists(query_embeddings),
+            n_results=fetch,
+            include=["documents", "metadatas", "distances"],
+        )
+        return [
+            QueryResult(
+                ids=ids[:n_results],
+                documents=docs[:n_results],
+                metadatas=metas[:n_results],
+                distances=dists[:n_results],
+            )
+            for ids, docs, metas, dists in zip(
+                results["ids"], results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def snapshot(self) -> dict[str, dict]:
+        stored = self.collection.get(include=["metadatas"])
+        return dict(zip(stored["ids"], stored["metadatas"]))
+
+    def get_fingerprint(self) -> str | None:
+        return (self.collection.metadata or {}).get(FINGERPRINT_KEY)
+
+    def set_fingerprint(self, fingerprint: str) -> None:
+        self._set_metadata(FINGERPRINT_KEY, fingerprint)
+
+    def get_settings(self) -> dict | None:
+        settings = (self.collection.metadata or {}).get(SETTINGS_KEY)
+        return json.loads(settings) if settings else None
+
+    def set_settings(self, settings: dict) -> None:
+        self._set_metadata(SETTINGS_KEY, json.dumps(settings, sort_keys=True))
+
+    def _set_metadata(self, key: str, value: str) -> None:
+        # modify() replaces the whole metadata and rejects hnsw:* keys; the
+        # HNSW settings live in the collection's configuration and are
+        # unaffected, so only our own keys are carried over.
+        metadata = {k: v for k, v in (self.collection.metadata or {}).items() if not k.startswith("hnsw:")}
+        metadata[key] = value
+        self.collection.modify(metadata=metadata)
+
+    def drop(self) -> None:
+        _delete_collection(self.name)
+
+
+def _as_lists(embeddings: Embeddings) -> list[list[float]]:
+    return embeddings.tolist() if isinstance(embeddings, np.ndarray) else embeddings
+
+
+# ─── NumPy (exact, in-process) ───────────────────────────────────────────────
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as contiguous float32 (zero rows are left as-is)."""
+    matrix = np.ascontiguousarray(np.atleast_2d(matrix), dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _spill(matrix: np.ndarray, directory: str | None) -> np.ndarray:
+    """
+    Move a matrix into a read-only memory map backed by an unlinked temp file.
+
+    Rows are paged in on access and can be evicted under memory pressure, so
+    only the vectors actually rescored occupy RAM. The file is deleted as soon
+    as it is mapped; the mapping keeps the data alive until it is dropped.
+    """
+    with tempfile.NamedTemporaryFile(dir=directory, prefix="rescore-", suffix=".f32") as f:
+        matrix.tofile(f)
+        f.flush()
+        return np.memmap(f.name, dtype=np.float32, mode="r", shape=matrix.shape)
+
+
+def _respill(matrix: np.ndarray, keep: np.ndarray, vectors: np.ndarray, directory: str | None) -> np.ndarray:
+    """
+    _spill of matrix[keep] followed by vectors, copying the kept rows through
+    in blocks — an update never holds a second full copy of a memory-mapped
+    matrix in RAM.
+    """
+    with tempfile.NamedTemporaryFile(dir=directory, prefix="rescore-", suffix=".f32") as f:
+        for start in range(0, len(keep), SCAN_BLOCK_ROWS):
+            np.ascontiguousarray(matrix[keep[start:start + SCAN_BLOCK_ROWS]]).tofile(f)
+        vectors.tofile(f)
+        f.flush()
+        shape = (len(keep) + len(vectors), matrix.shape[1])
+        return np.memmap(f.name, dtype=np.float32, mode="r", shape=shape)
+
+
+@dataclass(frozen=True)
+class _Rows:
+    """Immutable row set — mutations build a new one and swap it in."""
+    ids: list[str]
+    documents: list[str]
+    metadatas: list[dict]
+    matrix: np.ndarray
+    index: QuantizedIndex | None = None
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Cosine search over a dense embedding matrix.
+
+    By default the search is exact: one matrix product over the in-memory
+    float32 matrix. With a quantization mode the full scan runs over compact
+    codes instead; the best rescore_candidates per query are then rescored
+    against the full-precision vectors, which are memory-mapped from disk.
+    """
+
+    backend = "numpy"
+    name = "in-memory"
+
+    def __init__(
+        self,
+        quantization: str = VECTOR_QUANTIZATION,
+        rescore_candidates: int = QUANTIZED_RESCORE_CANDIDATES,
+        rescore_dir: str | None = QUANTIZED_RESCORE_DIR,
+    ) -> None:
+        self.quantization = quantization
+        self.rescore_candidates = rescore_candidates
+        self.rescore_dir = rescore_dir
+        self._rows = _Rows([], [], [], np.empty((0, 0), dtype=np.float32))
+        self._fingerprint: str | None = None
+        self._settings: dict | None = None
+
+    @property
+    def nbytes(self) -> int:
+        """Resident memory of the scanned index (codes if quantized, else the float32 matrix)."""
+        rows = self._rows
+        return rows.index.nbytes if rows.index is not None else rows.matrix.nbytes
+
+    def _build(self, ids: list[str], documents: list[str], metadatas: list[dict], matrix: np.ndarray) -> _Rows:
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        index = build_quantized_index(self.quantization, matrix)
+        if index is not None:
+            matrix = _spill(matrix, self.rescore_dir)
+        return _Rows(ids=ids, documents=documents, metadatas=metadatas, matrix=matrix, index=index)
+
+    def add(self, ids: list[str], documents: list[str], embeddings: Embeddings, metadatas: list[dict]) -> None:
+        existing = set(self._rows.ids).intersection(ids)
+        if existing:
+            raise ValueError(f"IDs already exist: {sorted(existing)[:5]}")
+        self.upsert(ids, documents, embeddings, metadatas)
+
+    def upsert(self, ids: list[str], documents: list[str], embeddings: Embeddings, metadatas: list[dict]) -> None:
+        if not ids:
+            return
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        replaced = set(ids)
+        rows = self._rows
+        keep = [i for i, chunk_id in enumerate(rows.ids) if chunk_id not in replaced]
+        self._rows = self._splice(rows, keep, list(ids), list(documents), list(metadatas), vectors)
+
+    def update_metadata(self, ids: list[str], metadatas: list[dict]) -> None:
+        rows = self._rows
+        changed = dict(zip(ids, metadatas))
+        if not changed.keys() & set(rows.ids):
+            return
+        # Same matrix and codes: no re-quantizing or re-spilling needed
+        self._rows = replace(rows, metadatas=[changed.get(i, m) for i, m in zip(rows.ids, rows.metadatas)])
+
+    def delete(self, ids: list[str]) -> None:
+        removed = set(ids)
+        rows = self._rows
+        keep = [i for i, chunk_id in enumerate(rows.ids) if chunk_id not in removed]
+        if len(keep) == len(rows.ids):
+            return
+        vectors = np.empty((0, rows.matrix.shape[1]), dtype=np.float32)
+        self._rows = self._splice(rows, keep, [], [], [], vectors)
+
+    def _splice(
+        self,
+        rows: _Rows,
+        keep: list[int],
+        ids: list[str],
+        documents: list[str],
+        metadatas: list[dict],
+        vectors: np.ndarray,
+    ) -> _Rows:
+        """
+        rows at keep, followed by the given new rows.
+
+        A quantized store keeps the fitted index: it encodes only the new
+        rows and streams the kept vectors into a new spill file, instead of
+        loading the memory-mapped matrix to quantize it all again. Readers
+        may still hold rows, so nothing is changed in place.
+        """
+        ids = [rows.ids[i] for i in keep] + ids
+        documents = [rows.documents[i] for i in keep] + documents
+        metadatas = [rows.metadatas[i] for i in keep] + metadatas
+        if rows.index is None or not ids:
+            kept_matrix = rows.matrix[keep] if rows.matrix.size else vectors[:0]
+            return self._build(ids, documents, metadatas, np.vstack([kept_matrix, vectors]))
+        keep_rows = np.asarray(keep, dtype=np.intp)
+        return _Rows(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            matrix=_respill(rows.matrix, keep_rows, vectors, self.rescore_dir),
+            index=rows.index.updated(keep_rows, vectors),
+        )
+
+    def query(
+        self,
+        query_embeddings: Embeddings,
+        n_results: int,
+        ef_search: int | None = None,
+    ) -> list[QueryResult]:
+        rows = self._rows
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32))
+        total = len(rows.ids)
+        n = min(n_results, total)
+        if n == 0:
+            return [QueryResult() for _ in range(len(queries))]
+
+        if rows.index is not None:
+            return self._query_quantized(rows, queries, n)
+
+        similarities = queries @ rows.matrix.T
+        if n < total:
+            top = np.argpartition(-similarities, n - 1, axis=1)[:, :n]
+        else:
+            top = np.broadcast_to(np.arange(total), (len(queries), total))
+
+        results: list[QueryResult] = []
+        for row, candidates in zip(similarities, top):
+            order = candidates[np.argsort(-row[candidates])]
+            results.append(_result(rows, order, row[order]))
+        return results
+
+    def _query_quantized(self, rows: _Rows, queries: np.ndarray, n: int) -> list[QueryResult]:
+        """Approximate scan over the codes, then exact rescoring of the candidates."""
+        candidates = rows.index.candidates(queries, max(n, self.rescore_candidates))
+        results: list[QueryResult] = []
+        for query, cand in zip(queries, candidates):
+            cand = np.sort(cand)  # ascending rows → sequential reads from the memory map
+            similarities = rows.matrix[cand] @ query
+            top = np.argsort(-similarities)[:n]
+            results.append(_result(rows, cand[top], similarities[top]))
+        return results
+
+    def count(self) -> int:
+        return len(self._rows.ids)
+
+    def snapshot(self) -> dict[str, dict]:
+        rows = self._rows
+        return dict(zip(rows.ids, rows.metadatas))
+
+    def get_fingerprint(self) -> str | None:
+        return self._fingerprint
+
+    def set_fingerprint(self, fingerprint: str) -> None:
+        self._fingerprint = fingerprint
+
+    def get_settings(self) -> dict | None:
+        return self._settings
+
+    def set_settings(self, settings: dict) -> None:
+        self._settings = dict(settings)
+
+    def drop(self) -> None:
+        self._rows = _Rows([], [], [], np.empty((0, 0), dtype=np.float32))
+
+
+def _result(rows: _Rows, order: np.ndarray, similarities: np.ndarray) -> QueryResult:
+    return QueryResult(
+        ids=[rows.ids[i] for i in order],
+        documents=[rows.documents[i] for i in order],
+        metadatas=[rows.metadatas[i] for i in order],
+        distances=(1.0 - similarities).tolist(),
+    )
+
+
+# ─── Blue/green collections (chroma) ─────────────────────────────────────────
+#
+# Every full build goes into a new collection named
+# "<CHROMA_COLLECTION>-<timestamp>-<suffix>". CHROMA_COLLECTION itself is an
+# alias: which collection is live (and which one preceded it, for rollback)
+# is recorded in an alias file next to the persisted data, written
+# atomically. In-process, the IndexSnapshot swap is what flips searches.
+
+
+def _alias_path() -> Path | None:
+    if VECTOR_BACKEND != "chroma" or not CHROMA_PERSIST_DIR:
+        return None
+    return Path(CHROMA_PERSIST_DIR) / f"{CHROMA_COLLECTION}.alias.json"
+
+
+def read_alias() -> dict:
+    """{"live": name, "previous": name | None, "promoted_at": epoch seconds} — {} if none."""
+    path = _alias_path()
+    if path is None or not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def write_alias(live: str, previous: str | None) -> None:
+    """Point the alias at live (keeping previous for rollback). Atomic rename."""
+    path = _alias_path()
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"live": live, "previous": previous, "promoted_at": time.time()}))
+    os.replace(tmp, path)
+
+
+def _new_collection_name() -> str:
+    return f"{CHROMA_COLLECTION}-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _delete_collection(name: str) -> None:
+    try:
+        get_chroma_client().delete_collection(name)
+        logger.info(f"Dropped collection {name}")
+    except Exception:
+        pass  # already gone
+
+
+def delete_stale_collections(keep: set[str]) -> None:
+    """Drop every collection under this alias except those in keep (e.g. orphans of a crashed build)."""
+    for name in _collection_names():
+        if name not in keep and (name == CHROMA_COLLECTION or name.startswith(f"{CHROMA_COLLECTION}-")):
+            _delete_collection(name)
+
+
+def _collection_names() -> list[str]:
+    return [c if isinstance(c, str) else c.name for c in get_chroma_client().list_collections()]
+
+
+def open_chroma_collection(name: str) -> "ChromaStore | None":
+    """An existing collection by name, or None if it doesn't exist."""
+    return ChromaStore(name=name) if name in _collection_names() else None
+
+
+# ─── Factory ──────────────────────────────────────────────────────────────────
+
+def create_vector_store(backend: str = VECTOR_BACKEND) -> VectorStore:
+    """
+    A new, empty store on the given backend, ready for a clean (re-)ingest.
+
+    Never touches the live index: chroma gets a fresh versioned collection.
+    """
+    if backend == "chroma":
+        return ChromaStore(name=_new_collection_name())
+    if backend == "numpy":
+        return NumpyVectorStore()
+    raise ValueError(f"Unknown VECTOR_BACKEND: {backend!r}")
+
+
+def open_persisted_store(backend: str = VECTOR_BACKEND) -> VectorStore | None:
+    """The live index left by a previous run (via the alias), or None if there is none."""
+    if backend == "chroma" and CHROMA_PERSIST_DIR:
+        live = read_alias().get("live")
+        return open_chroma_collection(live) if live else None
+    return None
@@ -0,0 +1,143 @@
+"""
+Policy directory watcher.
+
+Without it, an edited policy only becomes searchable after a manual
+POST /ingest or a restart. With POLICY_WATCH_ENABLED, a background thread
+watches POLICIES_DIR through watchfiles (inotify on Linux, or stat polling
+where native events don't arrive). A burst of changes — an editor's
+write-rename, a git checkout of several files — is debounced into one
+batch, and the batch goes to the ingest job runner as an incremental
+ingest of just the touched .md files. The runner coalesces jobs, so a
+steady stream of edits never queues more than one re-index behind the
+running one.
+
+policy_change_to_searchable_seconds measures from a change (the file's
+mtime) to the ingest job covering it having published the new index.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+
+from . import metrics
+from .config import (
+    POLICIES_DIR,
+    POLICY_WATCH_DEBOUNCE_MS,
+    POLICY_WATCH_ENABLED,
+    POLICY_WATCH_MAX_DELAY_MS,
+    POLICY_WATCH_POLL_MS,
+    POLICY_WATCH_POLLING,
+)
+from .jobs import get_ingest_jobs
+
+logger = logging.getLogger(__name__)
+
+
+def _is_policy_file(change, path: str) -> bool:
+    """Only the files load_documents reads: *.md, skipping editor lock/temp files."""
+    name = Path(path).name
+    return name.endswith(".md") and not name.startswith(".")
+
+
+class PolicyWatcher:
+    """Thread that turns debounced changes in a directory into ingest jobs."""
+
+    def __init__(
+        self,
+        directory: Path,
+        debounce_ms: int = 500,
+        max_delay_ms: int = 5000,
+        force_polling: bool = False,
+        poll_ms: int = 1000,
+    ) -> None:
+        self.directory = directory
+        self.debounce_ms = debounce_ms
+        self.max_delay_ms = max_delay_ms
+        self.force_polling = force_polling
+        self.poll_ms = poll_ms
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="policy-watcher", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        from watchfiles import watch
+
+        mode = f"polling every {self.poll_ms}ms" if self.force_polling else "filesystem events"
+        logger.info(f"Watching {self.directory} for policy changes ({mode}, {self.debounce_ms}ms debounce)")
+        last_batch = time.time()
+        try:
+            for changes in watch(
+                self.directory,
+                watch_filter=_is_policy_file,
+                debounce=self.max_delay_ms,
+                step=self.debounce_ms,
+                stop_event=self._stop,
+                force_polling=self.force_polling or None,  # None: watchfiles decides
+                poll_delay_ms=self.poll_ms,
+                recursive=False,
+                raise_interrupt=False,
+            ):
+                now = time.time()
+                self._submit({Path(path).name for _, path in changes}, since=last_batch, now=now)
+                last_batch = now
+        except Exception:
+            logger.exception("Policy watcher stopped")
+
+    def _submit(self, files: set[str], since: float, now: float) -> None:
+        """
+        Queue an incremental ingest of files. The change time is the earliest
+        mtime among them, but no earlier than the previous batch (a copied file
+        can keep an old mtime) — deleted files have none, so they count from now.
+        """
+        mtimes = []
+        for name in files:
+            try:
+                mtimes.append((self.directory / name).stat().st_mtime)
+            except FileNotFoundError:
+                pass
+        changed_at = min(max(min(mtimes, default=now), since), now)
+
+        metrics.counter("policy_watch_batches").inc()
+        metrics.counter("policy_watch_files_changed").inc(len(files))
+        job = get_ingest_jobs().submit(files=files, changed_at=changed_at)
+        logger.info(f"Policy change: {', '.join(sorted(files))} → ingest job {job.id}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+
+# ─── Module-level singleton ──────────────────────────────────────────────────
+
+_policy_watcher: PolicyWatcher | None = None
+
+
+def start_policy_watcher() -> PolicyWatcher | None:
+    """Start watching POLICIES_DIR if POLICY_WATCH_ENABLED (no-op otherwise)."""
+    global _policy_watcher
+    if not POLICY_WATCH_ENABLED or _policy_watcher is not None:
+        return _policy_watcher
+    if not POLICIES_DIR.is_dir():
+        logger.warning(f"Policy watcher not started: {POLICIES_DIR} is not a directory")
+        return None
+    _policy_watcher = PolicyWatcher(
+        POLICIES_DIR,
+        debounce_ms=POLICY_WATCH_DEBOUNCE_MS,
+        max_delay_ms=POLICY_WATCH_MAX_DELAY_MS,
+        force_polling=POLICY_WATCH_POLLING,
+        poll_ms=POLICY_WATCH_POLL_MS,
+    )
+    _policy_watcher.start()
+    return _policy_watcher
+
+
+def shutdown_policy_watcher() -> None:
+    """Stop the watcher thread (called on app shutdown)."""
+    global _policy_watcher
+    if _policy_watcher is not None:
+        _policy_watcher.stop()
+        _policy_watcher = None
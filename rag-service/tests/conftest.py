@@ -0,0 +1,82 @@
+"""
+Shared fixtures: a stub embedding model and simulated restarts over a
+persisted Chroma index.
+"""
+
+import hashlib
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src import embedding_cache, ingest, vector_store
+
+POLICIES = Path(__file__).resolve().parents[1] / "data" / "policies"
+
+MODEL_DIMS = {"stub-a": 32, "stub-b": 48}
+
+
+class _WhitespaceTokenizer:
+    """Just enough of a tokenizers.Tokenizer for ingest's token-length bucketing."""
+
+    def encode_batch(self, texts: list[str]) -> list[SimpleNamespace]:
+        return [SimpleNamespace(attention_mask=[1] * len(text.split())) for text in texts]
+
+
+class StubEncoder:
+    """Deterministic bag-of-words vectors; the dimension depends on the model name."""
+
+    def __init__(self, model_name: str) -> None:
+        self.dim = MODEL_DIMS[model_name]
+        self.tokenizer = _WhitespaceTokenizer()
+
+    def encode(self, sentences: list[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        out = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            for word in sentence.lower().split():
+                seed = int(hashlib.md5(word.encode()).hexdigest(), 16) % 2**32
+                out[i] += np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return out / np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+
+
+def query_live(dim: int) -> list[str]:
+    """Ids of the top 3 live chunks for a fixed query vector of the model's dimension."""
+    snapshot = ingest.get_index_snapshot()
+    vector = np.ones((1, dim), dtype=np.float32)
+    if snapshot.projection is not None:
+        vector = snapshot.projection.transform(vector)
+    return snapshot.store.query(vector, n_results=3)[0].ids
+
+
+@pytest.fixture
+def policies(tmp_path) -> Path:
+    """A scratch copy of the bundled policy documents."""
+    directory = tmp_path / "policies"
+    shutil.copytree(POLICIES, directory)
+    return directory
+
+
+@pytest.fixture
+def restart(policies, tmp_path, monkeypatch):
+    """Returns start(model, pca_dim) → IngestStats, simulating a fresh process each call."""
+    persist_dir = str(tmp_path / "chroma")
+    for module in (ingest, vector_store):
+        monkeypatch.setattr(module, "VECTOR_BACKEND", "chroma")
+        monkeypatch.setattr(module, "CHROMA_PERSIST_DIR", persist_dir)
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_CACHE_PATH", "")
+    monkeypatch.setattr(ingest, "INGEST_WORKERS", 0)
+
+    def start(model: str, pca_dim: int = 0) -> ingest.IngestStats:
+        monkeypatch.setattr(ingest, "EMBEDDING_MODEL", model)
+        monkeypatch.setattr(ingest, "PCA_DIM", pca_dim)
+        monkeypatch.setattr(ingest, "load_encoder", lambda *args, **kwargs: StubEncoder(model))
+        monkeypatch.setattr(ingest, "_embedding_model", None)
+        monkeypatch.setattr(ingest, "_snapshot", ingest.IndexSnapshot(store=None, chunk_count=0, version=0))
+        monkeypatch.setattr(ingest, "_previous", None)
+        monkeypatch.setattr(embedding_cache, "_embedding_cache", None)
+        monkeypatch.setattr(vector_store, "_chroma_client", None)
+        return ingest.ensure_index(policies)
+
+    return start
@@ -0,0 +1,49 @@
+"""
+Incremental ingest of an edited document.
+
+Only the chunks whose text changed are re-embedded, but every chunk of the
+document must end up tagged with its new file hash — otherwise the
+file-level skip never fires for it again, and a files-scoped ingest
+fingerprints the other documents with stale hashes.
+Run with: python -m pytest tests/
+"""
+
+from src import ingest
+
+
+def _file_hashes(source: str) -> set[str]:
+    stored = ingest.get_index_snapshot().store.snapshot()
+    return {metadata["file_hash"] for metadata in stored.values() if metadata["source"] == source}
+
+
+def test_edit_refreshes_file_hash_of_unchanged_chunks(restart, policies, monkeypatch):
+    restart("stub-a")
+    path = policies / "returns_policy.md"
+    old_hash = _file_hashes(path.name)
+    with path.open("a") as f:
+        f.write("\n\nGift cards bought during a promotion cannot be returned.\n")
+
+    stats = ingest.ingest_documents(policies)
+    assert stats.unchanged > 0 and stats.added + stats.updated > 0
+    assert _file_hashes(path.name) == {ingest._content_hash(path.read_text())} != old_hash
+
+    chunked = []
+    original = ingest._chunk_document
+    monkeypatch.setattr(ingest, "_chunk_document", lambda name, text: chunked.append(name) or original(name, text))
+    again = ingest.ingest_documents(policies)
+    assert (again.added, again.updated, again.removed) == (0, 0, 0)
+    assert chunked == []
+
+
+def test_files_scoped_ingest_keeps_the_corpus_fingerprint(restart, policies):
+    restart("stub-a")
+    with (policies / "returns_policy.md").open("a") as f:
+        f.write("\n\nGift cards bought during a promotion cannot be returned.\n")
+    ingest.ingest_documents(policies)
+
+    with (policies / "shipping_policy.md").open("a") as f:
+        f.write("\n\nOrders to PO boxes ship by standard post only.\n")
+    ingest.ingest_documents(policies, files=["shipping_policy.md"])
+
+    store = ingest.get_index_snapshot().store
+    assert store.get_fingerprint() == ingest.corpus_fingerprint(ingest.load_documents(policies))
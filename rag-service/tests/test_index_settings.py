@@ -0,0 +1,79 @@
+"""
+Restarting over a persisted Chroma index with different embedding settings.
+
+Incremental ingest only re-embeds chunks whose content changed, so a change
+of EMBEDDING_MODEL or PCA_DIM must trigger a full rebuild instead — never
+reuse (or "update") vectors built with the old settings.
+Run with: python -m pytest tests/
+"""
+
+from conftest import MODEL_DIMS, query_live
+from src import ingest, vector_store
+
+
+def test_unchanged_settings_reuse_the_index(restart):
+    first = restart("stub-a")
+    assert first.added == first.chunks > 0
+
+    second = restart("stub-a")
+    assert (second.added, second.updated, second.unchanged) == (0, 0, first.chunks)
+
+
+def test_model_change_rebuilds(restart):
+    first = restart("stub-a")
+
+    stats = restart("stub-b")
+    assert stats.added == first.chunks
+    assert ingest.get_index_snapshot().store.get_settings()["embedding_model"] == "stub-b"
+    assert len(query_live(MODEL_DIMS["stub-b"])) == 3
+
+    again = restart("stub-b")
+    assert again.added == 0 and again.unchanged == first.chunks
+
+
+def test_pca_dim_change_rebuilds_and_refits(restart):
+    first = restart("stub-a", pca_dim=16)
+    assert ingest.get_index_snapshot().projection.output_dim == 16
+
+    stats = restart("stub-a", pca_dim=8)
+    assert stats.added == first.chunks
+    assert ingest.get_index_snapshot().projection.output_dim == 8
+    assert len(query_live(MODEL_DIMS["stub-a"])) == 3
+
+
+def test_pca_disabled_rebuilds_at_full_dimension(restart):
+    first = restart("stub-a", pca_dim=16)
+
+    stats = restart("stub-a", pca_dim=0)
+    assert stats.added == first.chunks
+    assert ingest.get_index_snapshot().projection is None
+    assert len(query_live(MODEL_DIMS["stub-a"])) == 3
+
+
+def test_capped_pca_dim_reuses_the_index(restart):
+    # PCA_DIM above the model's dimension: the fitted projection is capped at 32
+    first = restart("stub-a", pca_dim=64)
+    assert ingest.get_index_snapshot().projection.output_dim == MODEL_DIMS["stub-a"]
+
+    second = restart("stub-a", pca_dim=64)
+    assert (second.added, second.unchanged) == (0, first.chunks)
+    assert len(query_live(MODEL_DIMS["stub-a"])) == 3
+
+
+def test_hnsw_graph_change_rebuilds(restart, monkeypatch):
+    first = restart("stub-a")
+
+    monkeypatch.setattr(ingest, "HNSW_M", 32)
+    stats = restart("stub-a")
+    assert stats.added == first.chunks
+    assert ingest.get_index_snapshot().store.get_settings()["hnsw_m"] == 32
+
+
+def test_search_ef_change_applies_in_place(restart, monkeypatch):
+    first = restart("stub-a")
+
+    monkeypatch.setattr(vector_store, "HNSW_SEARCH_EF", 40)
+    stats = restart("stub-a")
+    assert stats.added == 0 and stats.unchanged == first.chunks
+    store = ingest.get_index_snapshot().store
+    assert store.collection.configuration["hnsw"]["ef_search"] == 40
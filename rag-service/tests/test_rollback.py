@@ -0,0 +1,45 @@
+"""
+A rollback racing an incremental ingest.
+
+The update is diffed against the store that was live when the ingest
+started; if a rollback swaps that store out in the meantime, publishing the
+update would make the rolled-back-from store live again — and the grace
+timer would then drop it from under searches.
+Run with: python -m pytest tests/
+"""
+
+import pytest
+
+from conftest import MODEL_DIMS, query_live
+from src import ingest
+
+
+@pytest.mark.parametrize("hook", ["load_documents", "embed_chunks"])
+def test_rollback_during_update_keeps_live_index(restart, policies, monkeypatch, hook):
+    restart("stub-a")
+    ingest.ingest_documents(policies, full=True)
+    rolled_back_from = ingest.get_index_snapshot().store
+
+    with (policies / "returns_policy.md").open("a") as f:
+        f.write("\n\nGift cards bought during a promotion cannot be returned.\n")
+
+    original = getattr(ingest, hook)
+    calls = []
+
+    def rollback_once(*args, **kwargs):
+        if not calls:
+            ingest.rollback_index()
+        calls.append(hook)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(ingest, hook, rollback_once)
+    ingest.ingest_documents(policies)
+
+    snapshot = ingest.get_index_snapshot()
+    assert snapshot.store is not rolled_back_from
+    assert ingest._previous.store is rolled_back_from
+
+    ingest._expire_previous(ingest._previous)
+    snapshot = ingest.get_index_snapshot()
+    assert snapshot.store.count() == snapshot.chunk_count > 0
+    assert len(query_live(MODEL_DIMS["stub-a"])) == 3